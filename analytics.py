@@ -0,0 +1,105 @@
+"""Tail-latency, fairness and switching analytics of a finished run.
+
+Means hide the slow processes, so this summarises the distribution of
+turnaround, waiting and response time (first dispatch minus arrival)
+with percentiles, how evenly the processes were served with Jain's
+fairness index, and how often the CPUs switched and preempted. Everything
+is computed with NumPy straight from the process table's columns and the
+timeline's logs, so a run of a million processes is summarised in a
+fraction of a second.
+
+    from analytics import analyze
+    engine = scheduler.Scheduler(table, "RR", 2).run()
+    print(analyze(engine.table, engine.timeline)['response_p99'])
+"""
+import numpy as np
+
+from process_table import STATE_CODES
+
+PERCENTILES = [50, 90, 99]
+METRICS = ['tat', 'wt', 'response']  # Per-process times summarised by percentiles
+
+# Keys of analyze's summary, in the order exports list them
+FIELDS = (['avg_response']
+          + [f'{name}_{stat}' for name in METRICS for stat in [f'p{q}' for q in PERCENTILES] + ['max']]
+          + ['fairness', 'context_switches', 'preemptions'])
+
+
+def per_process(table):
+    """Return each row's 'tat', 'wt' and 'response' times as arrays indexed like the table."""
+    column = lambda name: np.frombuffer(getattr(table, name), dtype=np.float64)
+    arrival = column('arrival')
+    tat = column('completion') - arrival
+    return {
+        'tat': tat,
+        'wt': tat - column('burst') - column('io_wait'),
+        'response': column('first_run') - arrival,
+    }
+
+
+def fairness(values):
+    """Return Jain's fairness index of `values`: 1 when all are equal, 1/n when one gets everything."""
+    squares = np.dot(values, values)
+    if not squares:
+        return 1.0
+    total = values.sum()
+    return float(total * total / (len(values) * squares))
+
+
+def context_switches(timeline):
+    """Return how many times a core went on to run a different process than the one it ran last."""
+    rows = np.frombuffer(timeline.segment_rows, dtype=np.int64)
+    cores = np.frombuffer(timeline.segment_cores, dtype=np.int64)
+    if timeline.cores > 1:
+        # Group each core's segments together, keeping their order
+        order = np.argsort(cores, kind='stable')
+        rows, cores = rows[order], cores[order]
+    return int(np.count_nonzero((rows[1:] != rows[:-1]) & (cores[1:] == cores[:-1])))
+
+
+def preemptions(timeline):
+    """Return how many times a running process was sent back to the ready queue for another.
+
+    Every Running -> Ready transition is a requeue (quantum expiry, SRTF
+    preemption or MLFQ demotion), but one whose process is dispatched
+    again at once on the same core never gave the CPU up, so it is left
+    out to agree with context_switches.
+    """
+    states = np.frombuffer(timeline.event_states, dtype=np.uint8)
+    times = np.frombuffer(timeline.event_times, dtype=np.float64)[:len(states)]
+    previous = np.frombuffer(timeline.event_previous, dtype=np.int64)[:len(states)]
+    before = np.maximum(previous, 0)  # Previous transition of each one's row; masked below when none
+    running = states == STATE_CODES['Running']
+    # Core of each Running event: they are logged together with the segments, in order
+    cores = np.full(len(states), -1, dtype=np.int64)
+    cores[running] = np.frombuffer(timeline.segment_cores, dtype=np.int64)[:np.count_nonzero(running)]
+
+    requeue = (states == STATE_CODES['Ready']) & (previous >= 0) & running[before]
+    immediate = (running & requeue[before] & (previous >= 0)
+                 & (times == times[before]) & (cores == cores[before[before]]))
+    return int(np.count_nonzero(requeue) - np.count_nonzero(immediate))
+
+
+def analyze(table, timeline=None):
+    """Return the FIELDS summary of a finished run of `table`.
+
+    'fairness' is Jain's index of the share of each process's turnaround
+    spent being served (its CPU and I/O time over its TAT), so it is 1 when
+    every process is slowed down by the same factor. The timeline
+    defaults to the one the scheduler attached to the table.
+    """
+    if timeline is None:
+        timeline = table.timeline
+    times = per_process(table)
+    tat = times['tat']
+    summary = {'avg_response': float(times['response'].mean())}
+    for name in METRICS:
+        values = np.percentile(times[name], PERCENTILES + [100])
+        for q, value in zip(PERCENTILES, values):
+            summary[f'{name}_p{q}'] = float(value)
+        summary[f'{name}_max'] = float(values[-1])
+    served = np.divide(tat - times['wt'], tat, out=np.ones_like(tat), where=tat > 0)
+    summary['fairness'] = fairness(served)
+    summary['context_switches'] = context_switches(timeline)
+    summary['preemptions'] = preemptions(timeline)
+    return summary
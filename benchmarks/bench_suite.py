@@ -0,0 +1,181 @@
+"""Scheduler and renderer benchmark suite with JSON results.
+
+For every algorithm, workload size and burst scale this measures the
+simulation time, the peak memory allocated during the run, the time to
+compute the run's analytics, and the per-frame cost of the Gantt and
+state renderers drawing on the Agg backend. Each result also carries the
+analytics summary itself. Workloads come from workload.make_table with a fixed seed and an
+arrival rate that keeps the CPU about 90% busy, so runs are comparable.
+RR and the top level of MLFQ use a quantum of a fifth of the mean burst so
+their number of events does not explode at large burst scales.
+
+Run from the repository root; no display is needed:
+
+    python -m benchmarks.bench_suite --sizes 10 1000 100000 --burst-scales 10 1000000 -o results.json
+    python -m benchmarks.bench_suite -o new.json --baseline results.json
+"""
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import analytics
+import scheduler
+import workload
+from renderers import GanttRenderer, StateRenderer
+
+SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+BURST_SCALES = [10, 1000, 1000000]
+UTILISATION = 0.9
+RENDER_MAX_SIZE = 1000000  # Largest workload whose rendering is timed
+RENDER_FRAMES = 100  # Frames sampled evenly across the run for render timing
+STATE_COLORS = {'New': '#FF9999', 'Ready': '#99FF99', 'Running': '#9999FF',
+                'Waiting': '#FFFF99', 'Terminated': '#CC99FF'}
+
+# Fields compared against a baseline, all "lower is better"
+TRACKED = ['sim_seconds', 'peak_mb', 'analytics_seconds', 'gantt_ms_per_frame', 'state_ms_per_frame']
+
+
+def make_workload(size, burst_scale, seed=0):
+    return workload.make_table(size, seed, rate=UTILISATION / burst_scale, mean_burst=burst_scale)
+
+
+def run_engine(table, algorithm, quantum):
+    return scheduler.Scheduler(table, algorithm, quantum).run()
+
+
+def measure_simulation(table, algorithm, quantum):
+    """Return (engine, seconds, peak MB) for one run; memory is measured on a second run."""
+    start = time.perf_counter()
+    engine = run_engine(table, algorithm, quantum)
+    seconds = time.perf_counter() - start
+
+    # tracemalloc slows allocation down, so it gets a run of its own
+    tracemalloc.start()
+    run_engine(table, algorithm, quantum)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return engine, seconds, peak / 1e6
+
+
+def measure_rendering(engine, frames=RENDER_FRAMES):
+    """Return the average ms per frame of the Gantt and state renderers."""
+    timeline = engine.timeline
+    end_time = engine.makespan()
+    colors = matplotlib.colormaps['tab10'].colors
+    color_map = {pid: colors[i % len(colors)] for i, pid in enumerate(engine.table.pids)}
+    step = max(len(timeline) // frames, 1)
+    sample = range(0, len(timeline), step)
+
+    results = {}
+    for name, renderer_class, reset_args in [
+            ('gantt', GanttRenderer, (engine.gantt_data, color_map, end_time)),
+            ('state', StateRenderer, (engine.table, STATE_COLORS, end_time))]:
+        figure = Figure(figsize=(12, 3))
+        FigureCanvasAgg(figure)
+        renderer = renderer_class(figure.add_subplot())
+        renderer.reset(*reset_args)
+        start = time.perf_counter()
+        for frame in sample:
+            renderer.render(timeline.frame(frame))
+        results[name] = (time.perf_counter() - start) * 1000 / len(sample)
+    return results
+
+
+def run_case(algorithm, size, burst_scale, seed=0, render_max=RENDER_MAX_SIZE):
+    table = make_workload(size, burst_scale, seed)
+    quantum = burst_scale / 5 if algorithm in ("RR", "MLFQ") else None
+    engine, seconds, peak_mb = measure_simulation(table, algorithm, quantum)
+    start = time.perf_counter()
+    summary = analytics.analyze(engine.table, engine.timeline)
+    analytics_seconds = time.perf_counter() - start
+    result = {
+        'algorithm': algorithm, 'size': size, 'burst_scale': burst_scale, 'quantum': quantum,
+        'events': len(engine.timeline.event_rows), 'frames': len(engine.timeline),
+        'sim_seconds': seconds, 'peak_mb': peak_mb, 'analytics_seconds': analytics_seconds,
+        'gantt_ms_per_frame': None, 'state_ms_per_frame': None,
+        **summary,
+    }
+    if size <= render_max:
+        render = measure_rendering(engine)
+        result['gantt_ms_per_frame'] = render['gantt']
+        result['state_ms_per_frame'] = render['state']
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Return lines describing tracked values more than `threshold` worse than the baseline."""
+    key = lambda r: (r['algorithm'], r['size'], r['burst_scale'])
+    previous = {key(r): r for r in baseline['results']}
+    lines = []
+    for result in results:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        for field in TRACKED:
+            if result[field] is None or not old.get(field):
+                continue
+            ratio = result[field] / old[field]
+            if ratio > 1 + threshold:
+                lines.append(f"{result['algorithm']} size={result['size']} burst={result['burst_scale']}: "
+                             f"{field} {old[field]:.4g} -> {result[field]:.4g} ({ratio:.2f}x)")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--algorithms", nargs="+", default=scheduler.ALGORITHMS,
+                        choices=scheduler.ALGORITHMS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--burst-scales", nargs="+", type=float, default=BURST_SCALES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--render-max", type=int, default=RENDER_MAX_SIZE,
+                        help="largest workload whose rendering is timed")
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        for burst_scale in args.burst_scales:
+            for algorithm in args.algorithms:
+                result = run_case(algorithm, size, burst_scale, args.seed, args.render_max)
+                results.append(result)
+                render = (f"  gantt {result['gantt_ms_per_frame']:.2f} ms/frame"
+                          f"  state {result['state_ms_per_frame']:.2f} ms/frame"
+                          if result['gantt_ms_per_frame'] is not None else "")
+                print(f"{algorithm:8} size={size:<8} burst={burst_scale:<10g} "
+                      f"sim {result['sim_seconds']:.3f}s  peak {result['peak_mb']:.1f} MB  "
+                      f"analytics {result['analytics_seconds']:.3f}s{render}")
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'matplotlib': matplotlib.__version__,
+        'seed': args.seed,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
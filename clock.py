@@ -0,0 +1,75 @@
+"""Shared animation clock that drives every simulation view from one timer."""
+import time
+
+
+class AnimationClock:
+    """Calls `render(frame)` for frames 0..frame_count-1 every `interval` ms.
+
+    Frames are scheduled against the wall clock measured from start(). When
+    rendering falls behind, the clock jumps to the frame that is due now
+    instead of drifting further late. `overruns` counts ticks whose render
+    took longer than the interval and `skipped` counts frames that were
+    never rendered. The last frame is always rendered.
+
+    With complete=False the frames are still being produced: the clock
+    plays what exists, waits at the newest frame, and picks up new ones
+    reported through update().
+    """
+
+    def __init__(self, widget, frame_count, interval, render, complete=True):
+        self.widget = widget  # Any object with Tk's after()/after_cancel()
+        self.frame_count = frame_count
+        self.complete = complete
+        self.interval = max(interval, 1)
+        self.render = render
+        self.frame = 0
+        self.rendered = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.start_time = None
+        self.after_id = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.after_id = self.widget.after(0, self.tick)
+
+    def stop(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def update(self, frame_count, complete=False):
+        """Report that `frame_count` frames now exist."""
+        self.frame_count = frame_count
+        self.complete = complete
+        if complete and self.frame >= frame_count:
+            # Waiting past the end: render the last frame again as the final one
+            self.frame = frame_count - 1
+
+    @property
+    def running(self):
+        return self.after_id is not None
+
+    def tick(self):
+        self.after_id = None
+        if self.frame >= self.frame_count:
+            if not self.complete:
+                # Wait for the next frames to be produced
+                self.after_id = self.widget.after(self.interval, self.tick)
+            return
+        began = time.perf_counter()
+        self.render(self.frame)
+        self.rendered += 1
+        if (time.perf_counter() - began) * 1000 > self.interval:
+            self.overruns += 1
+        if self.complete and self.frame >= self.frame_count - 1:
+            return
+
+        # Skip ahead to whichever frame is due by now, but not past the newest
+        elapsed = (time.perf_counter() - self.start_time) * 1000
+        due = int(elapsed // self.interval)
+        next_frame = max(self.frame + 1, min(due, self.frame_count - 1))
+        self.skipped += next_frame - self.frame - 1
+        self.frame = next_frame
+        delay = max(int(next_frame * self.interval - elapsed), 0)
+        self.after_id = self.widget.after(delay, self.tick)
@@ -0,0 +1,117 @@
+"""Vectorized scheduling for the non-preemptive FCFS and SJF algorithms.
+
+Once the execution order is fixed, a non-preemptive schedule follows the
+recurrence completion[k] = max(arrival[k], completion[k-1]) + burst[k].
+With C the cumulative burst sum this unrolls to
+
+    completion[k] = C[k] + max over j <= k of (arrival[j] - C[j-1])
+
+which NumPy evaluates with one cumulative-max scan. FCFS needs no further
+work; SJF first derives its order with a heap over the arrival-sorted
+processes.
+
+This is a standalone API for workloads too large for a timeline:
+scheduler.simulate, the sweep and the GUI do not use it, since it
+records no Gantt segments or state history. The order and the times
+equal scheduler.Scheduler's exactly when arrivals and bursts are
+integers. With fractional times the scan adds the same numbers in a
+different order, so they agree to floating-point rounding (about 1e-12
+relative; compare with np.allclose).
+
+    import numpy as np
+    from fastpath import simulate
+    result = simulate(np.random.randint(0, 10**6, 10**6), np.random.randint(1, 10, 10**6))
+"""
+import heapq
+
+import numpy as np
+
+FAST_ALGORITHMS = ["FCFS", "SJF"]
+
+
+def fcfs_order(arrival):
+    """Return process indices in FCFS execution order."""
+    # A stable sort keeps input order among equal arrivals, like the ready queue
+    return np.argsort(arrival, kind='stable')
+
+
+def sjf_order(arrival, burst):
+    """Return process indices in non-preemptive SJF execution order."""
+    by_arrival = fcfs_order(arrival)
+    arrivals = arrival[by_arrival].tolist()
+    bursts = burst[by_arrival].tolist()
+    n = len(arrivals)
+    # Heap keys are plain ints, burst rank * n + admission index, which
+    # compare much faster than tuples; ties go to the earlier arrival
+    ranks = np.unique(burst[by_arrival], return_inverse=True)[1].reshape(-1)
+    keys = (ranks.astype(np.int64) * n + np.arange(n)).tolist()
+    order = []
+    ready = []
+    push, pop, append = heapq.heappush, heapq.heappop, order.append
+    i = 0
+    time = 0
+    for _ in range(n):
+        if not ready and arrivals[i] > time:
+            time = arrivals[i]  # CPU idle until the next arrival
+        while i < n and arrivals[i] <= time:
+            push(ready, keys[i])
+            i += 1
+        k = pop(ready) % n
+        append(k)
+        time += bursts[k]
+    return by_arrival[np.array(order, dtype=np.int64)]
+
+
+def schedule(arrival, burst, algorithm="FCFS"):
+    """Return the execution order and per-process start/completion/TAT/WT arrays.
+
+    All arrays except 'order' are indexed like the input.
+    """
+    if algorithm not in FAST_ALGORITHMS:
+        raise ValueError(f"No vectorized path for algorithm: {algorithm}")
+    arrival = np.asarray(arrival, dtype=np.float64)
+    burst = np.asarray(burst, dtype=np.float64)
+    if arrival.shape != burst.shape or arrival.ndim != 1:
+        raise ValueError("Arrival and burst must be 1-D arrays of the same length")
+    if len(arrival) == 0:
+        raise ValueError("No processes to simulate")
+    if (arrival < 0).any():
+        raise ValueError("Arrival time cannot be negative")
+    if (burst <= 0).any():
+        raise ValueError("Burst time must be greater than zero")
+
+    order = fcfs_order(arrival) if algorithm == "FCFS" else sjf_order(arrival, burst)
+    a = arrival[order]
+    b = burst[order]
+    total = np.cumsum(b)
+    completion_sorted = total + np.maximum.accumulate(a - (total - b))
+
+    completion = np.empty_like(completion_sorted)
+    completion[order] = completion_sorted
+    tat = completion - arrival
+    return {
+        'order': order,
+        'first_run': completion - burst,
+        'completion': completion,
+        'tat': tat,
+        'wt': tat - burst,
+    }
+
+
+def calculate_metrics(burst, completion, tat, wt):
+    """Vectorized counterpart of scheduler.calculate_metrics."""
+    total_time = completion.max()
+    return {
+        'avg_tat': float(tat.mean()),
+        'avg_wt': float(wt.mean()),
+        'cpu_util': float(np.sum(burst) / total_time * 100),
+        'throughput': float(len(completion) / total_time),
+    }
+
+
+def simulate(arrival, burst, algorithm="FCFS"):
+    """Schedule the workload and return per-process arrays plus metrics."""
+    result = schedule(arrival, burst, algorithm)
+    result['metrics'] = calculate_metrics(np.asarray(burst, dtype=np.float64),
+                                          result['completion'], result['tat'], result['wt'])
+    return result
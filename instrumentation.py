@@ -0,0 +1,202 @@
+"""Phase timers and counters, and one-off profiling of a single run.
+
+A Stats object keeps a call count, total and worst time per named phase.
+Phases are timed by wrapping methods on one object, so code that is not
+being instrumented runs exactly as before and pays nothing. For a deeper
+look, capture() runs a function under cProfile and tracemalloc.
+
+    from instrumentation import Stats, instrument_engine
+    stats = Stats()
+    engine = instrument_engine(scheduler.Scheduler(table, "SRTF"), stats).run()
+    stats.dump("stats.json")
+
+Run it directly to time or profile a synthetic workload:
+
+    python instrumentation.py --count 100000 --algorithm SRTF --profile -o stats.json
+"""
+import argparse
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from functools import wraps
+
+# Scheduler methods timed by instrument_engine, and their phase names
+ENGINE_PHASES = {
+    'admit_arrivals': 'simulation.arrivals',
+    'check_preemption': 'simulation.preemption',
+    'check_quantum': 'simulation.quantum',
+    'check_levels': 'simulation.levels',
+    'select_next_process': 'simulation.selection',
+    'dispatch': 'simulation.selection',  # Several cores
+    'preempt_cores': 'simulation.preemption',
+    'start_io': 'simulation.io',
+    'finish_io': 'simulation.io',
+}
+PROFILE_TOP = 25  # Functions and allocation sites kept in a capture report
+
+
+class Stats:
+    """Named phase timers and event counters for one run."""
+
+    def __init__(self):
+        self.timers = {}  # name -> [calls, total seconds, max seconds]
+        self.counters = {}
+        self.profile = None  # Report of a capture() run, if one was made
+
+    def add_time(self, name, seconds):
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def timed(self, name, function):
+        """Return `function` wrapped to add each call's duration to timer `name`."""
+        add_time = self.add_time
+        clock = time.perf_counter
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                add_time(name, clock() - start)
+        return wrapper
+
+    def wrap(self, obj, attribute, name):
+        """Time every call of `obj.attribute` from now on, on this object only."""
+        setattr(obj, attribute, self.timed(name, getattr(obj, attribute)))
+
+    def as_dict(self):
+        """Return the timers, counters and profile as plain JSON-ready data."""
+        return {
+            'timers': {name: {'calls': calls, 'total_ms': total * 1000,
+                              'mean_ms': total * 1000 / calls, 'max_ms': worst * 1000}
+                       for name, (calls, total, worst) in sorted(self.timers.items())},
+            'counters': dict(sorted(self.counters.items())),
+            'profile': self.profile,
+        }
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def summary(self):
+        """Return one text line per timer and counter, for display."""
+        lines = [f"{name:24} {calls:>9} calls {total * 1000:>10.1f} ms total "
+                 f"{total * 1000 / calls:>8.3f} ms mean {worst * 1000:>8.2f} ms max"
+                 for name, (calls, total, worst) in sorted(self.timers.items())]
+        lines += [f"{name:24} {value:>9}" for name, value in sorted(self.counters.items())]
+        return lines
+
+
+def unwrap(obj, attributes):
+    """Undo Stats.wrap for `attributes` of `obj`, restoring the class methods."""
+    for attribute in attributes:
+        obj.__dict__.pop(attribute, None)
+
+
+def instrument_engine(engine, stats):
+    """Time the phases of a Scheduler's event loop and its frame snapshots; return it."""
+    for attribute, name in ENGINE_PHASES.items():
+        stats.wrap(engine, attribute, name)
+    stats.wrap(engine.timeline, 'mark_frame', 'simulation.snapshot')
+    stats.wrap(engine, 'run', 'simulation.run')
+    return engine
+
+
+def count_run(engine, stats):
+    """Add the size of a finished run's logs to the counters."""
+    timeline = engine.timeline
+    stats.count('processes', len(engine.table))
+    stats.count('transitions', len(timeline.event_states))
+    stats.count('dispatches', len(timeline.segment_ends))
+    stats.count('frames', len(timeline))
+
+
+def capture(function, *args, top=PROFILE_TOP, profile_path=None, **kwargs):
+    """Call `function` under cProfile and tracemalloc; return (result, report).
+
+    The report lists the `top` functions by cumulative time and the `top`
+    allocation sites still holding memory at the end, with the peak traced
+    memory. The raw profile is also written to `profile_path` if given.
+    Only the calling thread is profiled.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        profiler.enable()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            profiler.disable()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    if profile_path is not None:
+        profiler.dump_stats(profile_path)
+    rows = sorted(pstats.Stats(profiler).stats.items(), key=lambda item: item[1][3], reverse=True)
+    functions = [{'function': f"{file}:{line}({name})", 'calls': calls,
+                  'own_ms': own * 1000, 'cumulative_ms': cumulative * 1000}
+                 for (file, line, name), (_, calls, own, cumulative, _) in rows[:top]]
+    allocations = [{'location': str(stat.traceback), 'size_mb': stat.size / 1e6, 'blocks': stat.count}
+                   for stat in snapshot.statistics('lineno')[:top]]
+    report = {'seconds': seconds, 'peak_mb': peak / 1e6,
+              'functions': functions, 'allocations': allocations}
+    return result, report
+
+
+def main():
+    import scheduler
+    import workload
+
+    parser = argparse.ArgumentParser(description="Time or profile one simulation of a synthetic workload.")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algorithm", default="FCFS", choices=scheduler.ALGORITHMS)
+    parser.add_argument("--quantum", type=float, default=2)
+    parser.add_argument("--profile", action="store_true",
+                        help="also run under cProfile and tracemalloc")
+    parser.add_argument("--profile-output", help="write the raw cProfile data here")
+    parser.add_argument("-o", "--output", help="write the stats as JSON here")
+    args = parser.parse_args()
+
+    # About 90% CPU load with the default mean burst of 5
+    table = workload.make_table(args.count, args.seed, rate=0.18)
+    stats = Stats()
+    engine = instrument_engine(scheduler.Scheduler(table, args.algorithm, args.quantum), stats)
+    if args.profile:
+        _, stats.profile = capture(engine.run, profile_path=args.profile_output)
+    else:
+        engine.run()
+    count_run(engine, stats)
+
+    print("\n".join(stats.summary()))
+    if stats.profile is not None:
+        print(f"\nProfiled run: {stats.profile['seconds']:.3f}s, peak {stats.profile['peak_mb']:.1f} MB")
+        for entry in stats.profile['functions'][:10]:
+            print(f"{entry['cumulative_ms']:>10.1f} ms  {entry['calls']:>9}  {entry['function']}")
+    if args.output:
+        stats.dump(args.output)
+        print(f"Stats written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""I/O device models for processes that block between CPU bursts.
+
+While a process does I/O it is in the Waiting state, off the CPU, at the
+device its burst names. Each device keeps its own queue and decides when
+a burst is served. The scheduler only calls two methods, so other models
+(priorities, seek times, shared buses) can be passed in its place:
+
+    request(row, duration, time) -> [(end time, row)] for bursts starting now
+    finish(row, time)            -> [(end time, row)] for bursts starting now
+"""
+from collections import deque
+
+
+class Device:
+    """Serves up to `channels` I/O bursts at once; the rest queue first come, first served."""
+
+    def __init__(self, name="Device", channels=1):
+        if channels < 1:
+            raise ValueError("A device needs at least one channel")
+        self.name = name
+        self.channels = channels
+        self.queue = deque()  # (row, duration) of bursts waiting for a channel
+        self.active = 0  # Bursts being served
+        self.busy_time = 0  # Channel time spent serving bursts
+
+    def request(self, row, duration, time):
+        """Accept an I/O burst of `duration` from `row` at `time`."""
+        if self.active < self.channels:
+            return [self.start(row, duration, time)]
+        self.queue.append((row, duration))
+        return []
+
+    def finish(self, row, time):
+        """End the burst `row` was being served for and start the next queued one."""
+        self.active -= 1
+        if self.queue:
+            return [self.start(*self.queue.popleft(), time)]
+        return []
+
+    def start(self, row, duration, time):
+        self.active += 1
+        self.busy_time += duration
+        return time + duration, row
+
+    def utilisation(self, total_time):
+        """Return the percentage of channel time spent serving bursts over `total_time`."""
+        return self.busy_time / (total_time * self.channels) * 100
+
+
+def make_devices(count):
+    """Return `count` single-channel devices named Device 0, Device 1, ..."""
+    return [Device(f"Device {i}") for i in range(count)]
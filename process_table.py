@@ -0,0 +1,271 @@
+"""Struct-of-arrays process store.
+
+Each process attribute lives in its own typed array, so a process costs a
+few dozen bytes instead of a dict with a dozen keys and its own state
+lists. ProcessRow gives the GUI and older code a dict-like view of one row.
+
+A process that does I/O has a sequence of bursts alternating CPU and I/O,
+starting and ending with CPU. The sequences of all rows share flat
+arrays indexed by per-row offsets, and `burst` holds each process's total
+CPU time.
+"""
+from array import array
+from numbers import Real
+
+STATES = ['New', 'Ready', 'Running', 'Waiting', 'Terminated']
+STATE_CODES = {name: code for code, name in enumerate(STATES)}
+
+NOT_SET = float('nan')  # completion/first_run of a process that has not got there yet
+
+
+class ProcessTable:
+    """Columns of process attributes, one row per process, in insertion order."""
+
+    def __init__(self):
+        self.pids = []
+        self.index = {}  # pid -> row, for O(1) lookups and duplicate checks
+        self.arrival = array('d')
+        self.burst = array('d')
+        self.priority = array('d')
+        self.remaining = array('d')
+        self.completion = array('d')
+        self.first_run = array('d')
+        self.io_wait = array('d')  # Time spent in the Waiting state during the run
+        self.state = bytearray()  # STATE_CODES
+        self.timeline = None  # Set by the scheduler; holds each row's state history
+
+        # Burst sequences: row r's are phases[phase_offsets[r]:phase_offsets[r + 1]],
+        # empty for a single CPU burst. phase_devices gives the device of each I/O burst.
+        self.phase_offsets = array('q', [0])
+        self.phases = array('d')
+        self.phase_devices = array('q')
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a table from process dicts such as scheduler.make_process returns."""
+        table = cls()
+        for p in records:
+            if 'pid' not in p or 'arrival' not in p or 'burst' not in p:
+                raise ValueError(f"Process data incomplete: {p}")
+            table.add(p['pid'], p['arrival'], p['burst'], p.get('priority', 0), p.get('devices'))
+        return table
+
+    def add(self, pid, arrival, burst, priority=0, devices=None):
+        """Append a process and return its row index.
+
+        `burst` is a CPU burst time, or a sequence of burst times alternating
+        CPU and I/O that starts and ends with CPU. `devices` gives the device
+        number of each I/O burst, device 0 for all of them by default.
+        """
+        if arrival < 0:
+            raise ValueError("Arrival time cannot be negative")
+        phases = None
+        if not isinstance(burst, Real):
+            phases = list(burst)
+            if len(phases) % 2 == 0:
+                raise ValueError("Bursts must alternate CPU and I/O, starting and ending with CPU")
+            if devices is None:
+                devices = [0] * (len(phases) // 2)
+            if len(devices) != len(phases) // 2 or (devices and min(devices) < 0):
+                raise ValueError("Each I/O burst needs a device number of 0 or more")
+            burst = sum(phases[::2])
+            if len(phases) == 1:
+                phases = None
+            elif min(phases) <= 0:
+                raise ValueError("Burst time must be greater than zero")
+        if burst <= 0:
+            raise ValueError("Burst time must be greater than zero")
+        if pid in self.index:
+            raise ValueError(f"Process with PID {pid} already exists")
+        row = len(self.pids)
+        self.index[pid] = row
+        self.pids.append(pid)
+        self.arrival.append(arrival)
+        self.burst.append(burst)
+        self.priority.append(priority)
+        self.remaining.append(burst if phases is None else phases[0])
+        self.completion.append(NOT_SET)
+        self.first_run.append(NOT_SET)
+        self.io_wait.append(0.0)
+        self.state.append(STATE_CODES['New'])
+        if phases is not None:
+            self.phases.extend(phases)
+            for device in devices:
+                self.phase_devices.extend((0, device))
+            self.phase_devices.append(0)
+        self.phase_offsets.append(len(self.phases))
+        return row
+
+    def extend(self, pids, arrival, burst, priority, phases=None):
+        """Append many processes from equal-length sequences, validating them together.
+
+        `phases` is None when every process has a single CPU burst, or
+        (offsets, lengths, devices) giving burst sequences laid out as in
+        the table, with offsets starting at 0 and one more than `pids`;
+        `burst` must then hold each process's total CPU time.
+        """
+        if not len(pids) == len(arrival) == len(burst) == len(priority):
+            raise ValueError("Process columns must have the same length")
+        if not pids:
+            return
+        if min(arrival) < 0:
+            raise ValueError("Arrival time cannot be negative")
+        if min(burst) <= 0 or (phases is not None and len(phases[1]) and min(phases[1]) <= 0):
+            raise ValueError("Burst time must be greater than zero")
+        if phases is not None and len(phases[2]) and min(phases[2]) < 0:
+            raise ValueError("Each I/O burst needs a device number of 0 or more")
+        first = len(self.pids)
+        new_index = dict(zip(pids, range(first, first + len(pids))))
+        if len(new_index) != len(pids) or not self.index.keys().isdisjoint(new_index):
+            # Only on failure: find the first PID seen twice to report it
+            seen = set(self.index)
+            for pid in pids:
+                if pid in seen:
+                    raise ValueError(f"Process with PID {pid} already exists")
+                seen.add(pid)
+        self.index.update(new_index)
+        self.pids.extend(pids)
+        self.arrival.extend(arrival)
+        self.burst.extend(burst)
+        self.priority.extend(priority)
+        self.remaining.extend(burst)
+        self.completion.extend(array('d', [NOT_SET]) * len(pids))
+        self.first_run.extend(array('d', [NOT_SET]) * len(pids))
+        self.io_wait.extend(array('d', [0.0]) * len(pids))
+        self.state.extend(bytes(len(pids)))  # STATE_CODES['New'] is 0
+        base = len(self.phases)
+        if phases is None:
+            self.phase_offsets.extend(array('q', [base]) * len(pids))
+        else:
+            offsets, lengths, devices = phases
+            self.phase_offsets.extend(base + offset for offset in offsets[1:])
+            self.phases.extend(lengths)
+            self.phase_devices.extend(devices)
+            self.reset_remaining(range(len(self.pids) - len(pids), len(self.pids)))
+
+    def reset(self):
+        """Clear per-run results so the table can be simulated again."""
+        n = len(self.pids)
+        self.remaining = array('d', self.burst)
+        self.completion = array('d', [NOT_SET]) * n
+        self.first_run = array('d', [NOT_SET]) * n
+        self.io_wait = array('d', [0.0]) * n
+        self.state = bytearray(n)
+        self.timeline = None
+        if self.phases:
+            self.reset_remaining(range(n))
+
+    def reset_remaining(self, rows):
+        # Processes with I/O start on their first CPU burst, not their total
+        offsets = self.phase_offsets
+        for row in rows:
+            if offsets[row] != offsets[row + 1]:
+                self.remaining[row] = self.phases[offsets[row]]
+
+    def bursts(self, row):
+        """Return the burst times of the process in `row`, alternating CPU and I/O."""
+        start, end = self.phase_offsets[row], self.phase_offsets[row + 1]
+        return list(self.phases[start:end]) if start != end else [self.burst[row]]
+
+    def clear(self):
+        self.__init__()
+
+    def is_set(self, column, row):
+        value = column[row]
+        return value == value  # NaN marks "not set"
+
+    def __len__(self):
+        return len(self.pids)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [ProcessRow(self, row) for row in range(*key.indices(len(self.pids)))]
+        if key < 0:
+            key += len(self.pids)
+        if not 0 <= key < len(self.pids):
+            raise IndexError("process row out of range")
+        return ProcessRow(self, key)
+
+    def __iter__(self):
+        return (ProcessRow(self, row) for row in range(len(self.pids)))
+
+
+def _optional(column):
+    def get(table, row):
+        value = getattr(table, column)[row]
+        return value if value == value else None
+    return get
+
+
+def _finished(value):
+    def get(table, row):
+        if not table.is_set(table.completion, row):
+            raise KeyError(value)
+        tat = table.completion[row] - table.arrival[row]
+        # Waiting time is time spent ready, so time blocked on I/O is not part of it
+        return tat if value == 'tat' else tat - table.burst[row] - table.io_wait[row]
+    return get
+
+
+def _history(part):
+    def get(table, row):
+        if table.timeline is None:
+            return [0] if part == 0 else ['New']
+        return table.timeline.history(row)[part]
+    return get
+
+
+# Row fields as they appear in process dicts, and how to read them
+_FIELDS = {
+    'pid': lambda table, row: table.pids[row],
+    'arrival': lambda table, row: table.arrival[row],
+    'burst': lambda table, row: table.burst[row],
+    'priority': lambda table, row: table.priority[row],
+    'remaining': lambda table, row: table.remaining[row],
+    'bursts': lambda table, row: table.bursts(row),
+    'cpu_time': lambda table, row: table.burst[row],
+    'io_wait': lambda table, row: table.io_wait[row],
+    'completion': _optional('completion'),
+    'first_run': _optional('first_run'),
+    'tat': _finished('tat'),
+    'wt': _finished('wt'),
+    'state': lambda table, row: STATES[table.state[row]],
+    'state_times': _history(0),
+    'state_names': _history(1),
+}
+
+
+class ProcessRow:
+    """Read-only dict-style view of one process in a ProcessTable."""
+
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, key):
+        return _FIELDS[key](self.table, self.row)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        if key in ('tat', 'wt'):
+            return self.table.is_set(self.table.completion, self.row)
+        return key in _FIELDS
+
+    def keys(self):
+        return [key for key in _FIELDS if key in self]
+
+    def __eq__(self, other):
+        return isinstance(other, ProcessRow) and other.table is self.table and other.row == self.row
+
+    def __hash__(self):
+        return hash((id(self.table), self.row))
+
+    def __repr__(self):
+        return f"ProcessRow({self.table.pids[self.row]!r})"
@@ -1,11 +1,43 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+import queue
 import random
-from matplotlib.animation import FuncAnimation
+import threading
+import time
+import analytics
+import instrumentation
+import recording
+import scheduler
+import streaming
+import traces
+import workload
+from clock import AnimationClock
+from process_table import ProcessTable
+from renderers import GanttRenderer, StateRenderer
+
+TABLE_MAX_ROWS = 20  # Rows shown before the process table starts scrolling
+TABLE_CHUNK = 200  # Table rows inserted at a time, as the user scrolls towards the end
+POLL_INTERVAL = 100  # ms between checks for messages from the simulation thread
+STATS_INTERVAL = 1.0  # Seconds between refreshes of the instrumentation panel during playback
+STREAM_WINDOW = 100  # Time units of a streaming run shown and measured
+STREAM_REFRESH = 1.0  # Seconds between redraws of a streaming run's window
+STREAM_LOAD = 0.9  # Arrival rate of a streaming run, as a share of what the cores can serve
+STREAM_STATE_ROWS = 30  # Processes shown in the state diagram while streaming
+METRIC_NAMES = {'tat': 'TAT', 'wt': 'WT', 'response': 'Response'}
+
+# Methods timed when instrumentation is on, and their phase names
+RENDER_PHASES = {
+    'show_run': 'setup.views',
+    'render_frame': 'render.frame',
+    'update_gantt': 'render.gantt',
+    'update_states': 'render.states',
+    'update_queues': 'render.queues',
+    'update_table': 'render.table',
+}
        
        
 class ProcessVisualizer:
@@ -14,8 +46,8 @@ class ProcessVisualizer:
         self.root.title("Process Visualization Tool")
         self.root.geometry("1400x900")
         
-        self.processes = []
-        self.all_processes = []
+        self.processes = ProcessTable()
+        self.all_processes = ProcessTable()
         self.state_colors = {
             'New': '#FF9999', 'Ready': '#99FF99', 'Running': '#9999FF',
             'Waiting': '#FFFF99', 'Terminated': '#CC99FF'
@@ -23,6 +55,10 @@ class ProcessVisualizer:
         
         # Initialize the current algorithm
         self.current_algorithm = "FCFS"
+        self.clock = None
+        self.simulation = None  # (thread, message queue, cancel event) of a running simulation
+        self.stats = None  # instrumentation.Stats of the current run, when instrumented
+        self.stats_shown = 0  # perf_counter time of the last instrumentation panel refresh
         
         # Main canvas with scrollbars
         self.main_canvas = tk.Canvas(self.root)
@@ -100,7 +136,7 @@ class ProcessVisualizer:
         ttk.Label(parent, text="Algorithm:").grid(row=4, column=0, pady=2, sticky="w")
         self.algo_var = tk.StringVar(value="FCFS")
         self.algo_combo = ttk.Combobox(parent, textvariable=self.algo_var, 
-                                      values=["FCFS", "SJF", "RR", "Priority", "SRTF"], width=20)
+                                      values=scheduler.ALGORITHMS, width=20)
         self.algo_combo.grid(row=4, column=1, pady=2, sticky="ew")
         self.algo_combo.bind("<<ComboboxSelected>>", self.algorithm_changed)
         
@@ -109,23 +145,92 @@ class ProcessVisualizer:
         self.quantum_entry.grid(row=5, column=1, pady=2, sticky="ew")
         self.quantum_entry.insert(0, "2")
         
-        ttk.Label(parent, text="Animation Speed (ms):").grid(row=6, column=0, pady=2, sticky="w")
+        # MLFQ quanta, one per level from the top, and its boost period (blank for none)
+        ttk.Label(parent, text="Quanta (MLFQ):").grid(row=6, column=0, pady=2, sticky="w")
+        self.quanta_entry = ttk.Entry(parent, state="disabled", width=20)
+        self.quanta_entry.grid(row=6, column=1, pady=2, sticky="ew")
+        self.quanta_entry.insert(0, "2 4 8")
+        ttk.Label(parent, text="Boost Period (MLFQ):").grid(row=7, column=0, pady=2, sticky="w")
+        self.boost_entry = ttk.Entry(parent, state="disabled", width=20)
+        self.boost_entry.grid(row=7, column=1, pady=2, sticky="ew")
+        self.boost_entry.insert(0, "50")
+        
+        ttk.Label(parent, text="Aging Rate (Priority):").grid(row=8, column=0, pady=2, sticky="w")
+        self.aging_entry = ttk.Entry(parent, state="disabled", width=20)
+        self.aging_entry.grid(row=8, column=1, pady=2, sticky="ew")
+        self.aging_entry.insert(0, "0")
+        
+        ttk.Label(parent, text="CPU Cores:").grid(row=9, column=0, pady=2, sticky="w")
+        self.cores_entry = ttk.Entry(parent, width=20)
+        self.cores_entry.grid(row=9, column=1, pady=2, sticky="ew")
+        self.cores_entry.insert(0, "1")
+        
+        ttk.Label(parent, text="Animation Speed (ms):").grid(row=10, column=0, pady=2, sticky="w")
         self.speed_entry = ttk.Entry(parent, width=20)
-        self.speed_entry.grid(row=6, column=1, pady=2, sticky="ew")
+        self.speed_entry.grid(row=10, column=1, pady=2, sticky="ew")
         self.speed_entry.insert(0, "500")
         
+        # Settings for the Random button's synthetic workload
+        workload_frame = ttk.LabelFrame(parent, text="Random Workload", padding="5")
+        workload_frame.grid(row=11, column=0, columnspan=2, pady=5, sticky="ew")
+        self.workload_entries = {}
+        for i, (field, default) in enumerate([("Count", "5"), ("Seed", ""), ("I/O Bursts", "0"),
+                                              ("Devices", "1")]):
+            ttk.Label(workload_frame, text=f"{field}:").grid(row=i, column=0, pady=2, sticky="w")
+            entry = ttk.Entry(workload_frame, width=17)
+            entry.grid(row=i, column=1, pady=2, sticky="ew")
+            entry.insert(0, default)
+            self.workload_entries[field] = entry
+        self.arrival_var = tk.StringVar(value=workload.ARRIVAL_PATTERNS[0])
+        self.burst_var = tk.StringVar(value=workload.BURST_DISTRIBUTIONS[0])
+        self.priority_dist_var = tk.StringVar(value=workload.PRIORITY_DISTRIBUTIONS[0])
+        for i, (field, var, values) in enumerate([
+                ("Arrivals", self.arrival_var, workload.ARRIVAL_PATTERNS),
+                ("Bursts", self.burst_var, workload.BURST_DISTRIBUTIONS),
+                ("Priorities", self.priority_dist_var, workload.PRIORITY_DISTRIBUTIONS)], 4):
+            ttk.Label(workload_frame, text=f"{field}:").grid(row=i, column=0, pady=2, sticky="w")
+            ttk.Combobox(workload_frame, textvariable=var, values=values, state="readonly",
+                         width=15).grid(row=i, column=1, pady=2, sticky="ew")
+        
         button_frame = ttk.Frame(parent)
-        button_frame.grid(row=7, column=0, columnspan=2, pady=10)
+        button_frame.grid(row=12, column=0, columnspan=2, pady=10)
         ttk.Button(button_frame, text="Add Process", command=self.add_process).grid(row=0, column=0, padx=5)
         ttk.Button(button_frame, text="Random", command=self.generate_random).grid(row=0, column=1, padx=5)
         ttk.Button(button_frame, text="Simulate", command=self.start_simulation).grid(row=0, column=2, padx=5)
         ttk.Button(button_frame, text="Clear", command=self.clear_all).grid(row=0, column=3, padx=5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_simulation,
+                                        state="disabled")
+        self.cancel_button.grid(row=0, column=4, padx=5)
+        ttk.Button(button_frame, text="Load Trace", command=self.load_trace).grid(row=1, column=0,
+                                                                                 columnspan=2, pady=5)
+        ttk.Button(button_frame, text="Save Run", command=self.save_run).grid(row=1, column=2, pady=5)
+        ttk.Button(button_frame, text="Load Run", command=self.load_run).grid(row=1, column=3, pady=5)
+        ttk.Button(button_frame, text="Stream", command=self.start_stream).grid(row=1, column=4, pady=5)
+        
+        # Opt-in phase timers, and a cProfile/tracemalloc capture of the next simulation
+        self.instrument_var = tk.BooleanVar(value=False)
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="Instrument", variable=self.instrument_var).grid(
+            row=2, column=0, columnspan=2, sticky="w")
+        ttk.Checkbutton(button_frame, text="Profile", variable=self.profile_var).grid(
+            row=2, column=2, sticky="w")
+        ttk.Button(button_frame, text="Save Stats", command=self.save_stats).grid(row=2, column=3)
         
         # Ready Queue display
         self.ready_frame = ttk.LabelFrame(parent, text="Ready Queue", padding="5")
-        self.ready_frame.grid(row=8, column=0, columnspan=2, pady=5, sticky="nsew")
+        self.ready_frame.grid(row=13, column=0, columnspan=2, pady=5, sticky="nsew")
         self.ready_queue_list = tk.Listbox(self.ready_frame, height=5, width=25)
         self.ready_queue_list.pack(fill="both", expand=True)
+        
+        # Animation clock status (frame budget overruns show a saturated UI)
+        self.clock_label = ttk.Label(parent, text="")
+        self.clock_label.grid(row=14, column=0, columnspan=2, pady=2, sticky="w")
+        
+        # Progress of a simulation still running in the background
+        self.progress_bar = ttk.Progressbar(parent, mode="determinate")
+        self.progress_bar.grid(row=15, column=0, columnspan=2, pady=2, sticky="ew")
+        self.progress_label = ttk.Label(parent, text="")
+        self.progress_label.grid(row=16, column=0, columnspan=2, pady=2, sticky="w")
 
     def algorithm_changed(self, event=None):
         # Handle algorithm change event.
@@ -140,8 +245,11 @@ class ProcessVisualizer:
             self.priority_label.grid_remove()
             self.priority_entry.grid_remove()
         
-        # Enable/disable quantum entry based on algorithm
+        # Enable/disable the algorithm's own settings
         self.quantum_entry.config(state="normal" if algorithm == "RR" else "disabled")
+        self.quanta_entry.config(state="normal" if algorithm == "MLFQ" else "disabled")
+        self.boost_entry.config(state="normal" if algorithm == "MLFQ" else "disabled")
+        self.aging_entry.config(state="normal" if algorithm == "Priority" else "disabled")
         
         # Update the table columns based on the algorithm
         self.update_table_columns()
@@ -178,9 +286,11 @@ class ProcessVisualizer:
         self.table.column("Priority", width=0, stretch=False)
         
         self.table.pack(side="left", fill="both", expand=True)
-        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.table.yview)
-        vsb.pack(side="right", fill="y")
-        self.table.configure(yscrollcommand=vsb.set)
+        self.table_vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.table.yview)
+        self.table_vsb.pack(side="right", fill="y")
+        self.table.configure(yscrollcommand=self.on_table_scroll)
+        self.reset_table()
+        self.table_time = None
 
     def update_table_columns(self):
         # Update table columns based on the current algorithm.
@@ -199,6 +309,7 @@ class ProcessVisualizer:
         gantt_toolbar_frame = ttk.Frame(gantt_frame)
         gantt_toolbar_frame.pack(fill="x")
         self.gantt_toolbar = NavigationToolbar2Tk(self.gantt_canvas, gantt_toolbar_frame)
+        self.gantt_renderer = GanttRenderer(self.gantt_ax)
         
         state_frame = ttk.LabelFrame(parent, text="Process State Diagram", padding="5")
         state_frame.grid(row=1, column=0, sticky="nsew", pady=5)
@@ -208,6 +319,7 @@ class ProcessVisualizer:
         state_toolbar_frame = ttk.Frame(state_frame)
         state_toolbar_frame.pack(fill="x")
         self.state_toolbar = NavigationToolbar2Tk(self.state_canvas, state_toolbar_frame)
+        self.state_renderer = StateRenderer(self.state_ax)
         
         queue_frame = ttk.LabelFrame(parent, text="Process Queues", padding="5")
         queue_frame.grid(row=2, column=0, sticky="nsew", pady=5)
@@ -217,6 +329,12 @@ class ProcessVisualizer:
         
         self.metrics_frame = ttk.LabelFrame(parent, text="Performance Metrics", padding="10")
         self.metrics_frame.grid(row=3, column=0, sticky="nsew", pady=5)
+        
+        self.stats_frame = ttk.LabelFrame(parent, text="Instrumentation", padding="10")
+        self.stats_frame.grid(row=4, column=0, sticky="nsew", pady=5)
+        self.stats_label = ttk.Label(self.stats_frame, text="", font="TkFixedFont", justify="left")
+        self.stats_label.pack(anchor="w")
+        self.stats_frame.grid_remove()  # Shown only for instrumented runs
 
     def add_process(self):
         try:
@@ -232,11 +350,11 @@ class ProcessVisualizer:
                 raise ValueError("Arrival time must be a valid number")
                 
             try:
-                bt = float(self.entries["Burst Time"].get())
-                if bt <= 0:
+                bursts, devices = self.parse_bursts(self.entries["Burst Time"].get())
+                if min(bursts) <= 0:
                     raise ValueError("Burst time must be greater than zero")
             except ValueError:
-                raise ValueError("Burst time must be a valid number")
+                raise ValueError("Burst time must be a valid number, or CPU and I/O bursts such as 5 3@1 2")
             
             # Only require priority for Priority algorithm
             if self.current_algorithm == "Priority":
@@ -250,16 +368,8 @@ class ProcessVisualizer:
                 # Default priority for non-Priority algorithms
                 priority = 0
             
-            # Check for duplicate PIDs
-            if any(p['pid'] == pid for p in self.processes):
-                raise ValueError(f"Process with PID {pid} already exists")
-            
-            process = {
-                'pid': pid, 'arrival': at, 'burst': bt, 'priority': priority,
-                'remaining': bt, 'state': 'New', 'states': [(0, 'New')],
-                'first_run': None, 'completion': None
-            }
-            self.processes.append(process)
+            # The table rejects duplicate PIDs
+            self.processes.add(pid, at, bursts, priority, devices)
             self.update_table()
             
             # Clear input fields
@@ -271,250 +381,523 @@ class ProcessVisualizer:
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
+    def parse_bursts(self, text):
+        # Split "5 3@1 2" into burst times alternating CPU and I/O and the
+        # device of each I/O burst (device 0 when no @device is given)
+        bursts, devices = [], []
+        for i, field in enumerate(text.replace(",", " ").split()):
+            if i % 2:
+                field, _, device = field.partition("@")
+                devices.append(int(device) if device else 0)
+            bursts.append(float(field))
+        if not bursts:
+            raise ValueError("Burst time cannot be empty")
+        return bursts, devices
+
     def generate_random(self):
-        self.processes.clear()
-        for i in range(5):
-            bt = random.randint(2, 10)  
-            arrival = random.randint(0, 5)  
-            priority = random.randint(1, 5) if self.current_algorithm == "Priority" else 0
-            process = {
-                'pid': f"P{i}", 'arrival': arrival,
-                'burst': bt, 'priority': priority,
-                'remaining': bt, 'state': 'New', 'states': [(0, 'New')],
-                'first_run': None, 'completion': None
-            }
-            self.processes.append(process)
+        # Replace the process list with a synthetic workload from the settings.
+        try:
+            count = int(self.workload_entries["Count"].get())
+            seed = self.workload_entries["Seed"].get().strip()
+            seed = int(seed) if seed else random.randrange(2 ** 32)
+            io_bursts = int(self.workload_entries["I/O Bursts"].get())
+            devices = int(self.workload_entries["Devices"].get())
+        except ValueError:
+            messagebox.showerror("Error", "Count, seed, I/O bursts and devices must be whole numbers")
+            return
+        # Priorities only matter to the Priority algorithm
+        priority = self.priority_dist_var.get() if self.current_algorithm == "Priority" else None
+        processes = ProcessTable()
+        try:
+            workload.make_table(count, seed, processes, arrival=self.arrival_var.get(),
+                                burst=self.burst_var.get(), priority=priority,
+                                io_bursts=io_bursts, devices=devices)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.processes = processes
+        self.reset_table()
+        self.update_table()
+
+    def load_trace(self):
+        # Replace the process list with the processes of a CSV or JSONL trace.
+        path = filedialog.askopenfilename(title="Load Trace",
+                                          filetypes=[("Process traces", "*.csv *.jsonl"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            processes = traces.load_trace(path)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.processes = processes
+        self.reset_table()
         self.update_table()
 
     def update_table(self, time=None):
-        # Update the process table dynamically.
-        for item in self.table.get_children():
-            self.table.delete(item)
+        # Update the process table, touching only rows whose values changed.
         process_list = self.all_processes if self.all_processes else self.processes
-        self.table['height'] = max(len(process_list), 1)  # Dynamic height, min 1
-        
-        for p in process_list:
-            if time is None:
-                if p.get('completion') is not None:
-                    state = 'Terminated'
-                else:
-                    state = p['state']
+        if process_list is not self.table_source or len(process_list) < len(self.table_items):
+            self.reset_table()
+            self.table_source = process_list
+        
+        # Append rows for processes added since the last update, up to the
+        # rows loaded so far; large workloads get more rows as they scroll
+        self.table_time = time
+        self.extend_table(max(len(self.table_items), TABLE_CHUNK))
+        
+        # Dynamic height, min 1; beyond TABLE_MAX_ROWS the table scrolls
+        self.table['height'] = min(max(len(process_list), 1), TABLE_MAX_ROWS)
+        self.refresh_table_rows()
+
+    def extend_table(self, count):
+        # Insert rows until the first `count` processes of the table's source have one.
+        process_list = self.table_source
+        for p in process_list[len(self.table_items):count]:
+            values = self.table_row(p, self.table_time)
+            self.table_items[p['pid']] = self.table.insert("", "end", values=values)
+            self.table_values[p['pid']] = values
+
+    def reset_table(self):
+        # Remove every row and forget the PID-to-row mapping.
+        self.table.delete(*self.table.get_children())
+        self.table_source = None
+        self.table_items = {}   # pid -> Treeview item id
+        self.table_values = {}  # pid -> values last written to that row
+
+    def refresh_table_rows(self):
+        # Re-format the rows inside the visible viewport and rewrite the ones
+        # that changed; rows scrolled out of view are refreshed when they return.
+        process_list = self.table_source or []
+        loaded = len(self.table_items)
+        top, bottom = self.table.yview()
+        first = int(top * loaded)
+        last = min(loaded, int(bottom * loaded) + 1)
+        for p in process_list[first:last]:
+            values = self.table_row(p, self.table_time)
+            if values != self.table_values[p['pid']]:
+                self.table.item(self.table_items[p['pid']], values=values)
+                self.table_values[p['pid']] = values
+
+    def on_table_scroll(self, first, last):
+        # Keep the scrollbar in sync, load the next rows once the end of the
+        # loaded ones comes into view and fill in rows that just came into view.
+        self.table_vsb.set(first, last)
+        if self.table_source is not None:
+            loaded = len(self.table_items)
+            if float(last) >= 1 and loaded < len(self.table_source):
+                self.extend_table(loaded + TABLE_CHUNK)  # Scrolls the table again, which refreshes
             else:
-                state = self.get_state_at_time(p, time)
-            
-            show_completion = False
-            if time is None:
-                show_completion = p.get('completion') is not None
+                self.refresh_table_rows()
+
+    def table_row(self, p, time):
+        # Format one process as a table row at the given time.
+        if time is None:
+            if p.get('completion') is not None:
+                state = 'Terminated'
             else:
-                show_completion = p.get('completion') is not None and p['completion'] <= time
-            
-            ct = f"{p['completion']:.2f}" if p.get('completion') is not None else '-'
-            tat = f"{p['tat']:.2f}" if 'tat' in p else '-'
-            wt = f"{p['wt']:.2f}" if 'wt' in p else '-'
-            
-            values = [
-                p['pid'], 
-                f"{p['arrival']:.2f}", 
-                f"{p['burst']:.2f}",
-                ct,
-                p['priority'] if self.current_algorithm == "Priority" else "",
-                state, 
-                tat, 
-                wt
-            ]
-            
-            self.table.insert("", "end", values=values)
+                state = p['state']
+        else:
+            state = self.get_state_at_time(p, time)
+        
+        ct = f"{p['completion']:.2f}" if p.get('completion') is not None else '-'
+        tat = f"{p['tat']:.2f}" if 'tat' in p else '-'
+        wt = f"{p['wt']:.2f}" if 'wt' in p else '-'
+        
+        return [
+            p['pid'], 
+            f"{p['arrival']:.2f}", 
+            f"{p['burst']:.2f}",
+            ct,
+            p['priority'] if self.current_algorithm == "Priority" else "",
+            state, 
+            tat, 
+            wt
+        ]
 
     def get_state_at_time(self, process, time):
         # Get the state of a process at a specific time
-        for t, s in reversed(process['states']):
-            if t <= time:
-                return s
-        return 'New'
+        return scheduler.state_at(process, time)
+
+    def read_settings(self):
+        """Return (algorithm, quantum, cores, options) from the controls, or None after showing an error."""
+        algorithm = self.algo_var.get()
+        
+        # Get quantum for RR algorithm
+        try:
+            quantum = float(self.quantum_entry.get()) if algorithm == "RR" else None
+        except ValueError:
+            messagebox.showerror("Error", "Invalid quantum value")
+            return None
+        try:
+            cores = int(self.cores_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Invalid core count")
+            return None
+        options = {}
+        try:
+            if algorithm == "MLFQ":
+                options['quanta'] = [float(q) for q in self.quanta_entry.get().replace(",", " ").split()]
+                boost = self.boost_entry.get().strip()
+                options['boost'] = float(boost) if boost else None
+            elif algorithm == "Priority":
+                options['aging'] = float(self.aging_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Invalid MLFQ or aging setting")
+            return None
+        return algorithm, quantum, cores, options
 
     def start_simulation(self):
         if not self.processes:
             messagebox.showwarning("Warning", "No processes to simulate")
             return
         
-        for p in self.processes:
-            if 'pid' not in p or 'arrival' not in p or 'burst' not in p or 'remaining' not in p:
-                messagebox.showerror("Error", f"Process data incomplete: {p}")
+        settings = self.read_settings()
+        if settings is None:
+            return
+        algorithm, quantum, cores, options = settings
+        
+        start = time.perf_counter()
+        try:
+            engine = scheduler.Scheduler(self.processes, algorithm, quantum, cores=cores, **options)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        self.cancel_simulation()
+        stats = self.instrument()
+        if stats is not None:
+            stats.add_time('setup.engine', time.perf_counter() - start)
+            instrumentation.instrument_engine(engine, stats)
+            stats.wrap(engine.timeline, 'frame', 'render.rebuild_frame')
+        self.processes = ProcessTable()
+        # The end time is known before the run, so the axes can be fixed now
+        interval = self.show_run(engine.all_processes, engine.timeline, algorithm, engine.quantum,
+                                 engine.makespan(),
+                                 {'quanta': engine.quanta, 'boost': engine.boost, 'aging': engine.aging})
+        
+        # Run the scheduler on a worker thread; it reports back through a queue
+        # polled from the Tk event loop
+        messages = queue.Queue()
+        cancel = threading.Event()
+        thread = threading.Thread(target=self.run_simulation,
+                                  args=(engine, messages, cancel, stats, self.profile_var.get()),
+                                  daemon=True)
+        self.simulation = (thread, messages, cancel)
+        self.cancel_button.config(state="normal")
+        self.progress_bar.config(maximum=len(self.all_processes), value=0)
+        self.progress_label.config(text="Simulating...")
+        thread.start()
+        self.root.after(POLL_INTERVAL, self.poll_simulation, self.simulation)
+        
+        # One clock renders a frame of every view per tick; it starts on the
+        # first frames while later ones are still being computed
+        self.clock = AnimationClock(self.root, len(self.timeline), interval, self.render_frame,
+                                    complete=False)
+        self.clock.start()
+
+    def start_stream(self):
+        """Simulate an endless random workload, showing its latest window until cancelled."""
+        settings = self.read_settings()
+        if settings is None:
+            return
+        algorithm, quantum, cores, options = settings
+        try:
+            seed = self.workload_entries["Seed"].get().strip()
+            seed = int(seed) if seed else random.randrange(2 ** 32)
+        except ValueError:
+            messagebox.showerror("Error", "Seed must be a whole number")
+            return
+        # Arrivals keep the cores about STREAM_LOAD busy, so the number of
+        # processes in the system, and the memory they use, stays steady
+        priority = self.priority_dist_var.get() if algorithm == "Priority" else None
+        source = workload.generate(None, seed, arrival=self.arrival_var.get(), burst=self.burst_var.get(),
+                                   priority=priority, rate=STREAM_LOAD * cores / workload.MEAN_BURST)
+        try:
+            engine = streaming.StreamingScheduler(source, algorithm, quantum, cores=cores,
+                                                  window=STREAM_WINDOW, **options)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        self.cancel_simulation()
+        instrumentation.unwrap(self, RENDER_PHASES)
+        self.stats = None
+        self.show_stats()
+        if self.clock is not None:
+            self.clock.stop()
+            self.clock = None
+        self.clock_label.config(text="")
+        self.visual_frame.grid()
+        self.timeline = engine.timeline
+        self.ready_queue_list.delete(0, tk.END)
+        self.queue_ax.clear()
+        self.queue_canvas.draw()
+        
+        messages = queue.Queue()
+        cancel = threading.Event()
+        thread = threading.Thread(target=self.run_stream, args=(engine, messages, cancel), daemon=True)
+        self.simulation = (thread, messages, cancel)
+        self.cancel_button.config(state="normal")
+        self.progress_label.config(text="Streaming...")
+        thread.start()
+        self.root.after(POLL_INTERVAL, self.poll_stream, self.simulation)
+
+    def run_stream(self, engine, messages, cancel):
+        """Run a streaming `engine` on the worker thread, posting its window to `messages`."""
+        shown = 0
+        
+        def progress(finished, total):
+            # Called on this thread between events, so the window and metrics
+            # are read while the engine is not changing them
+            nonlocal shown
+            now = time.perf_counter()
+            if now - shown >= STREAM_REFRESH or total is not None:
+                shown = now
+                messages.put(('window', engine.timeline.snapshot(), engine.metrics(), finished))
+        
+        try:
+            engine.run(progress=progress, should_stop=cancel.is_set)
+        except scheduler.SimulationCancelled:
+            messages.put(('cancelled',))
+        except Exception as e:
+            messages.put(('error', str(e)))
+        else:
+            messages.put(('window', engine.timeline.snapshot(), engine.metrics(), engine.finished))
+            messages.put(('ended',))
+
+    def poll_stream(self, simulation):
+        """Draw the latest window posted by a streaming run, then poll again while it runs."""
+        if self.simulation is not simulation:
+            return  # Cancelled or replaced by a newer run
+        _, messages, _ = simulation
+        latest = None
+        while True:
+            try:
+                message = messages.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == 'window':
+                latest = message[1:]  # Only the newest window is worth drawing
+            elif message[0] == 'ended':
+                if latest is not None:
+                    self.show_window(*latest)
+                self.stop_simulation("Stream ended")
+                return
+            elif message[0] == 'cancelled':
+                self.stop_simulation("Stream cancelled")
+                return
+            else:
+                self.stop_simulation("Stream failed")
+                messagebox.showerror("Error", message[1])
                 return
+        if latest is not None:
+            self.show_window(*latest)
+        self.root.after(POLL_INTERVAL, self.poll_stream, simulation)
+
+    def show_window(self, window, metrics, finished):
+        """Draw a streaming run's window in the Gantt and state views and show its rolling metrics."""
+        start, end = window['start'], window['time']
+        colors = plt.cm.tab10.colors
+        pids = {entry['pid'] for entry in window['segments']} | {p['pid'] for p in window['processes']}
+        color_map = {pid: colors[hash(pid) % len(colors)] for pid in pids}
+        self.gantt_renderer.reset(window['segments'], color_map, end, self.timeline.cores, start)
+        self.gantt_renderer.render({'time': end, 'gantt_end': len(window['segments'])})
+        self.state_renderer.reset(window['processes'][-STREAM_STATE_ROWS:], self.state_colors, end, start)
+        self.state_renderer.render({'time': end})
         
+        for widget in self.metrics_frame.winfo_children():
+            widget.destroy()
+        value = lambda v: '-' if v is None else f"{v:.2f}"
+        labels = [
+            f"Avg TAT: {value(metrics['avg_tat'])}",
+            f"Avg WT: {value(metrics['avg_wt'])}",
+            f"Avg Response: {value(metrics['avg_response'])}",
+            f"CPU Util: {metrics['cpu_util']:.2f}%",
+            f"Throughput: {metrics['throughput']:.2f} proc/unit"
+        ]
+        for i, text in enumerate(labels):
+            ttk.Label(self.metrics_frame, text=text).grid(row=0, column=i, padx=30)
+        percentiles = "  ".join(
+            f"{METRIC_NAMES[name]} " + "/".join(f"p{q}" for q in streaming.QUANTILES) + ": "
+            + " / ".join(value(metrics[f'{name}_p{q}']) for q in streaming.QUANTILES)
+            for name in streaming.METRICS)
+        ttk.Label(self.metrics_frame, text=f"Last {STREAM_WINDOW} units: {percentiles}").grid(
+            row=1, column=0, columnspan=len(labels), pady=5, sticky="w")
+        self.progress_label.config(text=f"Streaming... time {metrics['time']:.0f}, "
+                                        f"{finished} finished, {metrics['in_system']} in system")
+
+    def show_run(self, processes, timeline, algorithm, quantum, end_time, options=None):
+        """Point every view at a run's processes and timeline; return the frame interval.
+
+        `options` are the run's other Scheduler settings, kept for Save Run.
+        """
         self.visual_frame.grid()
-        self.all_processes = list(self.processes)
+        self.all_processes = processes
         self.color_map = {}
         colors = plt.cm.tab10.colors
         for i, p in enumerate(self.all_processes):
             self.color_map[p['pid']] = colors[i % len(colors)]
         
-        self.current_time = 0
-        self.gantt_data = []
-        self.ready_queue = []
-        self.running_process = None
-        self.processes = sorted(self.processes, key=lambda x: x['arrival'])
-        self.simulation_steps = []
+        self.algorithm = algorithm
+        self.algo_var.set(algorithm)
+        self.algorithm_changed()  # Also updates the table columns
+        self.quantum = quantum
+        self.options = options or {}
+        self.gantt_data = timeline.gantt_data
+        self.timeline = timeline
         self.execution_order = []
+        self.policy_metrics = {}
+        self.io_metrics = {}
+        self.end_time = end_time
         
-        algorithm = self.algo_var.get()
-        self.algorithm = algorithm
-        self.current_algorithm = algorithm  
+        self.update_table(0)
+        for widget in self.metrics_frame.winfo_children():
+            widget.destroy()
+        
+        self.gantt_renderer.reset(self.gantt_data, self.color_map, end_time, timeline.cores)
+        self.state_renderer.reset(self.all_processes, self.state_colors, end_time)
+        if self.clock is not None:
+            self.clock.stop()
         
-        # Get quantum for RR algorithm and initialize time slice counter
         try:
-            self.quantum = float(self.quantum_entry.get()) if algorithm == "RR" else None
+            return int(self.speed_entry.get())
         except ValueError:
-            messagebox.showerror("Error", "Invalid quantum value")
+            return 500  # Default to 500ms if invalid value
+
+    def save_run(self):
+        """Save the last finished simulation to a .npz recording."""
+        if self.clock is None or not self.clock.complete:
+            messagebox.showwarning("Warning", "No finished simulation to save")
+            return
+        path = filedialog.asksaveasfilename(title="Save Run", defaultextension=".npz",
+                                            filetypes=[("Recorded runs", "*.npz")])
+        if not path:
+            return
+        try:
+            recording.save_run(path, self.all_processes, self.timeline, self.algorithm, self.quantum,
+                               options=self.options, policy_metrics=self.policy_metrics,
+                               io_metrics=self.io_metrics)
+        except OSError as e:
+            messagebox.showerror("Error", str(e))
+
+    def load_run(self):
+        """Replay a recording in every view without simulating it again."""
+        path = filedialog.askopenfilename(title="Load Run", filetypes=[("Recorded runs", "*.npz")])
+        if not path:
+            return
+        try:
+            processes, timeline, info = recording.load_run(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
             return
         
-        self.time_slice = 0  # Track how long the current process has been running
-        
-        prev_running = None
-        while self.processes or self.ready_queue or self.running_process:
-            # Add newly arrived processes to ready queue
-            arrived = [p for p in self.processes if p['arrival'] <= self.current_time]
-            for p in arrived:
-                p['state'] = 'Ready'
-                p['states'].append((self.current_time, 'Ready'))
-                self.ready_queue.append(p)
-                self.processes.remove(p)
-            
-            # Handle preemption for SRTF algorithm
-            if self.running_process and self.algorithm == "SRTF" and self.ready_queue:
-                min_ready = min(self.ready_queue, key=lambda x: x['remaining'])
-                if min_ready['remaining'] < self.running_process['remaining']:
-                    self.running_process['state'] = 'Ready'
-                    self.running_process['states'].append((self.current_time, 'Ready'))
-                    self.ready_queue.append(self.running_process)
-                    self.running_process = min_ready
-                    self.ready_queue.remove(min_ready)
-                    self.running_process['state'] = 'Running'
-                    self.running_process['states'].append((self.current_time, 'Running'))
-                    self.time_slice = 0  # Reset time slice for new process
-            
-            # Handle Round Robin quantum properly
-            if self.algorithm == "RR" and self.running_process and self.time_slice >= self.quantum:
-                # Process has used its time quantum, move it back to ready queue
-                if self.running_process['remaining'] > 0:  # Only if not finished
-                    self.running_process['state'] = 'Ready'
-                    self.running_process['states'].append((self.current_time, 'Ready'))
-                    self.ready_queue.append(self.running_process)
-                    self.running_process = None
-                    self.time_slice = 0  # Reset time slice
-            
-            # Select next process if CPU is idle
-            if not self.running_process and self.ready_queue:
-                self.select_next_process()
-                self.time_slice = 0  # Reset time slice for new process
-            
-            # Track process changes for visualization
-            if self.running_process != prev_running:
-                if self.running_process:
-                    self.execution_order.append(self.running_process['pid'])
-                prev_running = self.running_process
-            
-            # Process execution for current time unit
-            if self.running_process:
-                if self.running_process['first_run'] is None:
-                    self.running_process['first_run'] = self.current_time
-                
-                # Use a fixed time step of 1
-                step_time = 1
-                self.running_process['remaining'] -= step_time
-                self.time_slice += step_time  # Increment time slice counter
-                
-                self.gantt_data.append({
-                    'pid': self.running_process['pid'],
-                    'start': self.current_time,
-                    'end': self.current_time + step_time
-                })
-                
-                # Process completion
-                if self.running_process['remaining'] <= 0:
-                    self.running_process['completion'] = self.current_time + step_time
-                    self.running_process['state'] = 'Terminated'
-                    self.running_process['states'].append((self.current_time + step_time, 'Terminated'))
-                    self.running_process['tat'] = self.running_process['completion'] - self.running_process['arrival']
-                    self.running_process['wt'] = self.running_process['tat'] - self.running_process['burst']
-                    self.running_process = None
-                    self.time_slice = 0  # Reset time slice
-            
-            # Save the current state for animation
-            state = {
-                'time': self.current_time,
-                'gantt_data': list(self.gantt_data),
-                'ready_queue': [p['pid'] for p in self.ready_queue],
-                'running_process': self.running_process['pid'] if self.running_process else None
-            }
-            step_time = 1
-            self.simulation_steps.append(state)
-            self.current_time += step_time
-        
-        # Ensure all processes are properly terminated after simulation
-        for p in self.all_processes:
-            if p.get('completion') is None:
-                # Process didn't complete during simulation
-                p['completion'] = self.current_time
-                p['state'] = 'Terminated'
-                p['states'].append((self.current_time, 'Terminated'))
-                p['tat'] = p['completion'] - p['arrival']
-                p['wt'] = p['tat'] - p['burst']
-            elif p['state'] != 'Terminated':
-                # Process completed but state wasn't set properly
-                p['state'] = 'Terminated'
-                p['states'].append((p['completion'], 'Terminated'))
-        
-        # Add one final simulation step to ensure all terminations are visible
-        final_state = {
-            'time': self.current_time,
-            'gantt_data': list(self.gantt_data),
-            'ready_queue': [],
-            'running_process': None
-        }
-        self.simulation_steps.append(final_state)
+        self.cancel_simulation()
+        stats = self.instrument()
+        if stats is not None:
+            stats.wrap(timeline, 'frame', 'render.rebuild_frame')
+        end_time = max(p['completion'] for p in processes)
+        interval = self.show_run(processes, timeline, info['algorithm'], info['quantum'], end_time,
+                                 info['options'])
+        self.progress_label.config(text="Replaying recorded run")
+        self.execution_order = timeline.execution_order()
+        self.policy_metrics = info['policy_metrics']
+        self.io_metrics = info['io_metrics']
+        self.update_table()
+        self.calculate_metrics()
+        self.show_stats()
+        self.clock = AnimationClock(self.root, len(self.timeline), interval, self.render_frame)
+        self.clock.start()
+
+    def run_simulation(self, engine, messages, cancel, stats=None, profile=False):
+        """Run `engine` on the worker thread, posting progress and the outcome to `messages`.
         
-        # Update table columns based on the algorithm
-        self.update_table_columns()
+        With `profile` set the run is captured under cProfile and tracemalloc
+        and the report stored on `stats`.
+        """
+        options = {'progress': lambda done, total: messages.put(('progress', done, total)),
+                   'should_stop': cancel.is_set}
+        try:
+            if profile:
+                _, stats.profile = instrumentation.capture(engine.run, **options)
+            else:
+                engine.run(**options)
+        except scheduler.SimulationCancelled:
+            messages.put(('cancelled',))
+        except Exception as e:
+            messages.put(('error', str(e)))
+        else:
+            messages.put(('done', engine))
+
+    def poll_simulation(self, simulation):
+        """Handle messages from the simulation thread, then poll again while it runs."""
+        if self.simulation is not simulation:
+            return  # Cancelled or replaced by a newer run
+        _, messages, _ = simulation
+        while True:
+            try:
+                message = messages.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == 'progress':
+                _, done, total = message
+                self.progress_bar.config(value=done)
+                self.progress_label.config(text=f"Simulating... {done}/{total} processes finished")
+                self.show_stats()
+            elif message[0] == 'done':
+                self.finish_simulation(message[1])
+                return
+            elif message[0] == 'cancelled':
+                self.stop_simulation("Simulation cancelled")
+                return
+            else:
+                self.stop_simulation("Simulation failed")
+                messagebox.showerror("Error", message[1])
+                return
+        self.clock.update(len(self.timeline))
+        self.root.after(POLL_INTERVAL, self.poll_simulation, simulation)
+
+    def finish_simulation(self, engine):
+        """Show the results of a completed run and let the animation play to its end."""
+        self.simulation = None
+        self.cancel_button.config(state="disabled")
+        self.progress_bar.config(value=len(self.all_processes))
+        self.progress_label.config(text="Simulation complete")
+        self.execution_order = engine.execution_order
+        self.policy_metrics = engine.policy_metrics()
+        self.io_metrics = engine.io_metrics()
+        end_time = max(engine.table.completion)
+        if end_time < self.end_time:
+            # Until now the end time was only an upper bound; fit the charts to the real one
+            self.end_time = end_time
+            self.gantt_renderer.reset(self.gantt_data, self.color_map, end_time, engine.cores)
+            self.state_renderer.reset(self.all_processes, self.state_colors, end_time)
+        if self.stats is not None:
+            instrumentation.count_run(engine, self.stats)
+        self.clock.update(len(self.timeline), complete=True)
         
         # Ensure final table update to show all processes as Terminated
         self.update_table()
         
         self.calculate_metrics()
-        
-        try:
-            interval = int(self.speed_entry.get())
-        except ValueError:
-            interval = 500  # Default to 500ms if invalid value
-        
-        self.anim = FuncAnimation(self.gantt_fig, self.update_gantt, frames=range(len(self.simulation_steps)), 
-                                 interval=interval, repeat=False, cache_frame_data=False)
-        self.state_anim = FuncAnimation(self.state_fig, self.update_states, frames=range(len(self.simulation_steps)), 
-                                       interval=interval, repeat=False, cache_frame_data=False)
-        self.queue_anim = FuncAnimation(self.queue_fig, self.update_queues, frames=range(len(self.simulation_steps)), 
-                                       interval=interval, repeat=False, cache_frame_data=False)
-        self.gantt_canvas.draw()
-        self.state_canvas.draw()
-        self.queue_canvas.draw()
+        self.show_stats()
 
-    def select_next_process(self):
-        """Select the next process based on the algorithm."""
-        if not self.ready_queue:
+    def cancel_simulation(self):
+        """Stop the simulation running in the background, if any."""
+        if self.simulation is None:
             return
-        
-        if self.algorithm == "FCFS":
-            self.running_process = self.ready_queue.pop(0)
-        elif self.algorithm == "SJF" or self.algorithm == "SRTF":
-            self.running_process = min(self.ready_queue, key=lambda x: x['remaining'])
-            self.ready_queue.remove(self.running_process)
-        elif self.algorithm == "RR":
-            self.running_process = self.ready_queue.pop(0)
-        elif self.algorithm == "Priority":
-            self.running_process = max(self.ready_queue, key=lambda x: x['priority'])
-            self.ready_queue.remove(self.running_process)
-        
-        self.running_process['state'] = 'Running'
-        self.running_process['states'].append((self.current_time, 'Running'))
+        thread, _, cancel = self.simulation
+        cancel.set()
+        thread.join()
+        self.stop_simulation("Simulation cancelled")
+
+    def stop_simulation(self, status):
+        # Forget the background run and halt its animation
+        self.simulation = None
+        self.cancel_button.config(state="disabled")
+        self.progress_label.config(text=status)
+        if self.clock is not None:
+            self.clock.stop()
 
     def show_execution_order(self):
         """Show execution order in the ready queue listbox."""
@@ -523,74 +906,60 @@ class ProcessVisualizer:
         for pid in self.execution_order:
             self.ready_queue_list.insert(tk.END, pid)
 
+    def render_frame(self, frame):
+        """Render one animation frame in the Gantt, state and queue views."""
+        self.update_gantt(frame)
+        self.update_states(frame)
+        self.update_queues(frame)
+        self.clock_label.config(text=f"Frame {frame + 1}/{len(self.timeline)}  "
+                                     f"Overruns: {self.clock.overruns}  Skipped: {self.clock.skipped}")
+        if self.stats is not None and time.perf_counter() - self.stats_shown > STATS_INTERVAL:
+            self.show_stats()
+
     def update_gantt(self, frame):
         """Update the Gantt chart during animation."""
-        self.gantt_ax.clear()
-        state = self.simulation_steps[frame]
-        gantt_data = state['gantt_data']
-        for entry in gantt_data:
-            self.gantt_ax.broken_barh([(entry['start'], entry['end'] - entry['start'])], 
-                                     (0, 1), facecolors=self.color_map[entry['pid']])
-            self.gantt_ax.text(entry['start'] + (entry['end'] - entry['start'])/2, 
-                              0.5, entry['pid'], ha='center', va='center')
-        
-        self.gantt_ax.set_ylim(0, 1)
-        self.gantt_ax.set_xlim(0, state['time'] + 1)
-        self.gantt_ax.set_title("Gantt Chart")
-        self.gantt_ax.set_yticks([])
-        self.gantt_canvas.draw()
+        state = self.timeline.frame(frame)
+        self.gantt_renderer.render(state)
         
         self.update_table(state['time'])
         self.ready_queue_list.delete(0, tk.END)
         for pid in state['ready_queue']:
             self.ready_queue_list.insert(tk.END, pid)
         
-        if frame == len(self.simulation_steps) - 1:
+        if self.clock.complete and frame == len(self.timeline) - 1:
             self.show_execution_order()
 
     def update_states(self, frame):
-        self.state_ax.clear()
-        state = self.simulation_steps[frame]
-        current_time = state['time']
-        self.state_ax.set_title("Process States")
-        self.state_ax.set_ylim(-0.5, len(self.all_processes) - 0.5)
-        self.state_ax.set_xlim(0, max(p.get('completion', current_time) for p in self.all_processes) + 1)
-        
-        for i, p in enumerate(self.all_processes):
-            for j, (time, state_name) in enumerate(p['states']):
-                if time > current_time:
-                    break
-                next_time = p['states'][j + 1][0] if j + 1 < len(p['states']) else (current_time if state_name != 'Terminated' else time + 1)
-                duration = min(next_time, current_time) - time
-                if duration > 0:
-                    self.state_ax.barh(i, duration, left=time, height=0.8, align='center', 
-                                      color=self.state_colors[state_name])
-                    if duration > 1:
-                        self.state_ax.text(time + duration / 2, i, state_name, ha='center', va='center', fontsize=8)
-        
-        self.state_ax.set_yticks(range(len(self.all_processes)))
-        self.state_ax.set_yticklabels([p['pid'] for p in self.all_processes])
-        self.state_canvas.draw()
+        """Update the process state diagram during animation."""
+        self.state_renderer.render(self.timeline.frame(frame))
+
     def update_queues(self, frame):
         """Update the process queue display during animation."""
         self.queue_ax.clear()
-        state = self.simulation_steps[frame]
+        state = self.timeline.frame(frame)
         ready_queue = state['ready_queue']
-        running_process = state['running_process']
+        waiting = state['waiting']
         self.queue_ax.set_title("Process Queues")
         self.queue_ax.set_ylim(0, 3)
-        self.queue_ax.set_xlim(0, max(5, len(ready_queue) + 1))
+        self.queue_ax.set_xlim(0, max(5, len(ready_queue) + 1, len(waiting) + 1, len(state['running'])))
+        
+        # Processes blocked on I/O, in the order they started waiting
+        for i, pid in enumerate(waiting):
+            self.queue_ax.add_patch(plt.Rectangle((i, 0), 0.8, 0.8, facecolor=self.state_colors['Waiting']))
+            self.queue_ax.text(i + 0.4, 0.4, pid, ha='center', va='center')
         
         for i, pid in enumerate(ready_queue):
             self.queue_ax.add_patch(plt.Rectangle((i, 1), 0.8, 0.8, facecolor=self.state_colors['Ready']))
             self.queue_ax.text(i + 0.4, 1.4, pid, ha='center', va='center')
         
-        if running_process:
-            self.queue_ax.add_patch(plt.Rectangle((0, 2), 0.8, 0.8, facecolor=self.state_colors['Running']))
-            self.queue_ax.text(0.4, 2.4, running_process, ha='center', va='center')
+        # One slot per core, left empty while the core is idle
+        for core, pid in enumerate(state['running']):
+            if pid:
+                self.queue_ax.add_patch(plt.Rectangle((core, 2), 0.8, 0.8, facecolor=self.state_colors['Running']))
+                self.queue_ax.text(core + 0.4, 2.4, pid, ha='center', va='center')
         
-        self.queue_ax.set_yticks([1.4, 2.4])
-        self.queue_ax.set_yticklabels(['Ready', 'Running'])
+        self.queue_ax.set_yticks([0.4, 1.4, 2.4])
+        self.queue_ax.set_yticklabels(['Waiting', 'Ready', 'Running'])
         self.queue_ax.set_xticks([])
         self.queue_canvas.draw()
 
@@ -599,44 +968,113 @@ class ProcessVisualizer:
         for widget in self.metrics_frame.winfo_children():
             widget.destroy()
         
-        total_time = max(p['completion'] for p in self.all_processes)
-        avg_tat = sum(p['tat'] for p in self.all_processes) / len(self.all_processes)
-        avg_wt = sum(p['wt'] for p in self.all_processes) / len(self.all_processes)
-        cpu_util = sum(p['burst'] for p in self.all_processes) / total_time * 100
-        throughput = len(self.all_processes) / total_time
+        cores = self.timeline.cores
+        results = scheduler.calculate_metrics(self.all_processes, self.gantt_data, cores)
+        results.update(analytics.analyze(self.all_processes, self.timeline))
         
         metrics = [
-            f"Avg TAT: {avg_tat:.2f}",
-            f"Avg WT: {avg_wt:.2f}",
-            f"CPU Util: {cpu_util:.2f}%",
-            f"Throughput: {throughput:.2f} proc/unit"
+            f"Avg TAT: {results['avg_tat']:.2f}",
+            f"Avg WT: {results['avg_wt']:.2f}",
+            f"Avg Response: {results['avg_response']:.2f}",
+            f"CPU Util: {results['cpu_util']:.2f}%",
+            f"Throughput: {results['throughput']:.2f} proc/unit"
         ]
         
         for i, metric in enumerate(metrics):
             ttk.Label(self.metrics_frame, text=metric).grid(row=0, column=i, padx=30)
+        
+        if cores > 1:
+            per_core = "  ".join(f"CPU {core}: {util:.1f}%" for core, util in enumerate(results['core_util']))
+            ttk.Label(self.metrics_frame, text=f"Per-core util: {per_core}", wraplength=1000).grid(
+                row=1, column=0, columnspan=len(metrics), pady=5, sticky="w")
+        
+        # Counters of the algorithm itself, such as MLFQ demotions and boosts
+        if self.policy_metrics:
+            text = "  ".join(f"{name.capitalize()}: {value}" for name, value in self.policy_metrics.items())
+            ttk.Label(self.metrics_frame, text=f"{self.algorithm}: {text}").grid(
+                row=2, column=0, columnspan=len(metrics), pady=5, sticky="w")
+        
+        if self.io_metrics:
+            per_device = "  ".join(f"Device {device}: {util:.1f}%"
+                                   for device, util in enumerate(self.io_metrics['io_util']))
+            ttk.Label(self.metrics_frame, text=f"I/O util: {per_device}", wraplength=1000).grid(
+                row=3, column=0, columnspan=len(metrics), pady=5, sticky="w")
+        
+        # Tail latency, fairness and switching
+        stats = [f"p{q}" for q in analytics.PERCENTILES] + ["max"]
+        tails = "   ".join(f"{METRIC_NAMES[name]} {'/'.join(stats)}: "
+                           + " / ".join(f"{results[f'{name}_{stat}']:.2f}" for stat in stats)
+                           for name in analytics.METRICS)
+        ttk.Label(self.metrics_frame, text=tails, wraplength=1000).grid(
+            row=4, column=0, columnspan=len(metrics), pady=5, sticky="w")
+        ttk.Label(self.metrics_frame, text=f"Fairness (Jain): {results['fairness']:.3f}   "
+                                           f"Context switches: {results['context_switches']}   "
+                                           f"Preemptions: {results['preemptions']}").grid(
+            row=5, column=0, columnspan=len(metrics), pady=5, sticky="w")
+
+    def instrument(self):
+        """Start timing the views for a new run if instrumentation is on; return its Stats."""
+        instrumentation.unwrap(self, RENDER_PHASES)
+        self.stats = None
+        if not (self.instrument_var.get() or self.profile_var.get()):
+            return None
+        self.stats = instrumentation.Stats()
+        for attribute, name in RENDER_PHASES.items():
+            self.stats.wrap(self, attribute, name)
+        return self.stats
+
+    def show_stats(self):
+        """Refresh the instrumentation panel, or hide it for uninstrumented runs."""
+        if self.stats is None:
+            self.stats_frame.grid_remove()
+            return
+        self.stats_frame.grid()
+        lines = self.stats.summary()
+        profile = self.stats.profile
+        if profile is not None:
+            lines.append(f"Profiled run: {profile['seconds']:.3f}s, peak memory {profile['peak_mb']:.1f} MB")
+            lines += [f"  {entry['cumulative_ms']:>10.1f} ms  {entry['function']}"
+                      for entry in profile['functions'][:5]]
+        self.stats_label.config(text="\n".join(lines))
+        self.stats_shown = time.perf_counter()
+
+    def save_stats(self):
+        """Write the current run's instrumentation to a JSON file."""
+        if self.stats is None:
+            messagebox.showwarning("Warning", "No instrumented run; tick Instrument and simulate first")
+            return
+        path = filedialog.asksaveasfilename(title="Save Stats", defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            self.stats.dump(path)
+        except OSError as e:
+            messagebox.showerror("Error", str(e))
 
     def clear_all(self):
         """Reset the interface and hide visualizations."""
+        self.cancel_simulation()
+        instrumentation.unwrap(self, RENDER_PHASES)
+        self.stats = None
+        self.show_stats()
         self.processes.clear()
         self.all_processes.clear()
         self.update_table()
-        self.state_ax.clear()
-        self.gantt_ax.clear()
+        self.state_renderer.clear()
+        self.gantt_renderer.clear()
         self.queue_ax.clear()
         self.state_canvas.draw()
         self.gantt_canvas.draw()
         self.queue_canvas.draw()
         for widget in self.metrics_frame.winfo_children():
             widget.destroy()
-        if hasattr(self, 'anim') and self.anim is not None:
-            self.anim.event_source.stop()
-            self.anim = None
-        if hasattr(self, 'state_anim') and self.state_anim is not None:
-            self.state_anim.event_source.stop()
-            self.state_anim = None
-        if hasattr(self, 'queue_anim') and self.queue_anim is not None:
-            self.queue_anim.event_source.stop()
-            self.queue_anim = None
+        if self.clock is not None:
+            self.clock.stop()
+            self.clock = None
+        self.clock_label.config(text="")
+        self.progress_bar.config(value=0)
+        self.progress_label.config(text="")
         self.ready_queue_list.delete(0, tk.END)
         self.ready_frame.config(text="Ready Queue")
         self.visual_frame.grid_remove()
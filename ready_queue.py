@@ -0,0 +1,191 @@
+"""Ready-queue structures used by the scheduler.
+
+Every queue exposes the same small interface (push, pop, peek, remove, len,
+iteration in insertion order, level by level for MLFQ) so the scheduler
+can swap them per algorithm. Queue items are process-table row indices.
+"""
+import heapq
+from collections import deque
+
+
+class FifoQueue:
+    """First-in first-out queue for FCFS and Round Robin."""
+
+    def __init__(self):
+        self.items = deque()
+
+    def push(self, process):
+        self.items.append(process)
+
+    def pop(self):
+        return self.items.popleft()
+
+    def peek(self):
+        return self.items[0]
+
+    def remove(self, process):
+        self.items.remove(process)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class HeapQueue:
+    """Binary heap ordered by `key(row)`, ties broken by insertion order.
+
+    Removal is lazy: the heap entry is marked dead and skipped when it
+    reaches the top, so push, pop and remove are all O(log N).
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.heap = []
+        self.entries = {}  # row -> heap entry, kept in insertion order
+        self.counter = 0
+
+    def push(self, process):
+        entry = [self.key(process), self.counter, process]
+        self.counter += 1
+        self.entries[process] = entry
+        heapq.heappush(self.heap, entry)
+
+    def pop(self):
+        process = self.peek()
+        heapq.heappop(self.heap)
+        del self.entries[process]
+        return process
+
+    def peek(self):
+        # Discard entries removed since they were pushed
+        while self.heap[0][2] is None:
+            heapq.heappop(self.heap)
+        return self.heap[0][2]
+
+    def remove(self, process):
+        entry = self.entries.pop(process)
+        entry[2] = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return (entry[2] for entry in self.entries.values())
+
+
+class AgingQueue(HeapQueue):
+    """HeapQueue for Priority with aging that counts the dispatches aging decided.
+
+    `overtakes` counts pops of a process while one of higher base priority
+    stays queued, which only aging makes happen. A second heap by base
+    priority, with lazy removal like the main one, finds that priority.
+    """
+
+    def __init__(self, key, priority):
+        super().__init__(key)
+        self.priority = priority
+        self.by_priority = []
+        self.ranked = {}  # row -> entry in by_priority
+        self.overtakes = 0
+
+    def push(self, process):
+        super().push(process)
+        entry = [-self.priority[process], self.counter, process]
+        self.ranked[process] = entry
+        heapq.heappush(self.by_priority, entry)
+
+    def pop(self):
+        process = super().pop()
+        self.ranked.pop(process)[2] = None
+        heap = self.by_priority
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        if heap and -heap[0][0] > self.priority[process]:
+            self.overtakes += 1
+        return process
+
+    def remove(self, process):
+        super().remove(process)
+        self.ranked.pop(process)[2] = None
+
+
+class MultiLevelQueue:
+    """One FIFO queue per level for MLFQ, level 0 served first.
+
+    `level(row)` gives the level a row is queued at when it is pushed. A
+    bitmap of the non-empty levels finds the highest one by its lowest set
+    bit, so push, peek and pop are O(1) however many processes are queued.
+    """
+
+    def __init__(self, levels, level):
+        self.queues = [deque() for _ in range(levels)]
+        self.level = level
+        self.bits = 0  # Bit i is set while level i has processes
+        self.size = 0
+
+    def push(self, process):
+        level = self.level(process)
+        self.queues[level].append(process)
+        self.bits |= 1 << level
+        self.size += 1
+
+    def top_level(self):
+        """Return the highest level with a process queued; the queue must not be empty."""
+        return (self.bits & -self.bits).bit_length() - 1
+
+    def pop(self):
+        level = self.top_level()
+        queue = self.queues[level]
+        process = queue.popleft()
+        if not queue:
+            self.bits &= ~(1 << level)
+        self.size -= 1
+        return process
+
+    def peek(self):
+        return self.queues[self.top_level()][0]
+
+    def remove(self, process):
+        level = self.level(process)
+        queue = self.queues[level]
+        queue.remove(process)
+        if not queue:
+            self.bits &= ~(1 << level)
+        self.size -= 1
+
+    def boost(self):
+        """Move every queued process to level 0, keeping their order."""
+        top = self.queues[0]
+        for queue in self.queues[1:]:
+            top.extend(queue)
+            queue.clear()
+        self.bits = 1 if top else 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (process for queue in self.queues for process in queue)
+
+
+def make_ready_queue(algorithm, table, aging=0, clock=None, levels=1, level=None):
+    """Return the ready queue that gives `algorithm` its selection order over `table` rows.
+
+    Priority with an `aging` rate raises a waiting process's priority by
+    `aging` per time unit, with `clock()` giving the current time. MLFQ
+    queues rows at `level(row)`, one of `levels` levels.
+    """
+    if algorithm in ("SJF", "SRTF"):
+        return HeapQueue(lambda row: table.remaining[row])
+    if algorithm == "Priority":
+        if aging:
+            # Aged priority is priority + aging * (now - queued at); between two
+            # waiting processes its order is that of priority - aging * queued at,
+            # which never changes, so the heap needs no rebuilding as time passes
+            return AgingQueue(lambda row: aging * clock() - table.priority[row], table.priority)
+        return HeapQueue(lambda row: -table.priority[row])
+    if algorithm == "MLFQ":
+        return MultiLevelQueue(levels, level)
+    return FifoQueue()
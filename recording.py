@@ -0,0 +1,144 @@
+"""Save finished runs to a compact binary file and load them back for replay.
+
+A recording is a NumPy .npz archive of flat columns: the process table,
+per-process results, the timeline's transition, segment and frame logs,
+the scheduler settings, the run's analytics summary and its policy and
+I/O counters. Columns are written straight from the typed arrays and read
+back into them without per-event Python objects, so a run with millions
+of events reopens in well under a second.
+
+    from recording import save_run, load_run
+    save_run("run.npz", engine.table, engine.timeline, "RR", 2)
+    table, timeline, info = load_run("run.npz")
+"""
+from array import array
+
+import numpy as np
+
+import analytics
+from process_table import ProcessTable, STATES
+from timeline import Timeline
+
+FORMAT_VERSION = 2
+
+# Typed-array attributes stored as columns, with their array typecodes
+TABLE_COLUMNS = {'arrival': 'd', 'burst': 'd', 'priority': 'd', 'remaining': 'd',
+                 'completion': 'd', 'first_run': 'd'}
+IO_COLUMNS = {'io_wait': 'd', 'phase_offsets': 'q', 'phases': 'd', 'phase_devices': 'q'}
+TIMELINE_COLUMNS = {'event_times': 'd', 'event_rows': 'q',
+                    'segment_rows': 'q', 'segment_cores': 'q', 'segment_starts': 'd', 'segment_ends': 'd',
+                    'frame_times': 'd', 'frame_events': 'q', 'frame_segments': 'q'}
+
+
+def save_run(path, table, timeline, algorithm, quantum=None, compress=False, options=None,
+             policy_metrics=None, io_metrics=None):
+    """Write a finished run to `path` as an .npz archive.
+
+    `options` holds the Scheduler settings 'quanta', 'boost' and 'aging'
+    the run used, and `policy_metrics` and `io_metrics` what the engine's
+    methods of those names returned.
+    """
+    options = options or {}
+    policy_metrics = policy_metrics or {}
+    columns = {name: np.frombuffer(getattr(table, name), dtype=np.float64)
+               for name in TABLE_COLUMNS}
+    for name, code in IO_COLUMNS.items():
+        columns[name] = np.frombuffer(getattr(table, name), dtype=np.dtype(code))
+    for name, code in TIMELINE_COLUMNS.items():
+        column = np.frombuffer(getattr(timeline, name), dtype=np.dtype(code))
+        if code == 'q' and (not len(column) or column.max() < 2 ** 31):
+            column = column.astype(np.int32)  # Rows and log offsets rarely need 64 bits
+        columns[name] = column
+    tat = columns['completion'] - columns['arrival']
+    summary = analytics.analyze(table, timeline)
+    save = np.savez_compressed if compress else np.savez
+    save(path,
+         version=np.array(FORMAT_VERSION),
+         algorithm=np.array(algorithm),
+         quantum=np.array(np.nan if quantum is None else quantum),
+         quanta=np.array(options.get('quanta') or [], dtype=np.float64),
+         boost=np.array(np.nan if options.get('boost') is None else options['boost']),
+         aging=np.array(options.get('aging', 0)),
+         cores=np.array(timeline.cores),
+         states=np.array(STATES),
+         pids=np.array([str(pid) for pid in table.pids]),
+         state=np.frombuffer(bytes(table.state), dtype=np.uint8),
+         event_states=np.frombuffer(bytes(timeline.event_states), dtype=np.uint8),
+         tat=tat,
+         wt=tat - columns['burst'] - columns['io_wait'],
+         response=columns['first_run'] - columns['arrival'],
+         metric_names=np.array(analytics.FIELDS),
+         metric_values=np.array([summary[name] for name in analytics.FIELDS], dtype=np.float64),
+         policy_names=np.array(list(policy_metrics), dtype=str),
+         policy_values=np.array(list(policy_metrics.values()), dtype=np.int64),
+         io_util=np.array((io_metrics or {}).get('io_util', []), dtype=np.float64),
+         **columns)
+
+
+def load_run(path):
+    """Read a run saved by save_run.
+
+    Returns (table, timeline, info) where info holds 'algorithm',
+    'quantum', 'cores', 'options' as save_run took them, 'metrics', the
+    analytics summary saved with the run, and 'policy_metrics' and
+    'io_metrics'. The table's per-run results and state histories come
+    from the file, so nothing is simulated again.
+    """
+    try:
+        data = np.load(path)
+    except ValueError:
+        raise ValueError(f"Not a recorded run: {path}")  # Neither .npz nor .npy
+    if not isinstance(data, np.lib.npyio.NpzFile) or 'version' not in data:
+        raise ValueError(f"Not a recorded run: {path}")
+    with data:
+        if int(data['version']) != FORMAT_VERSION or list(data['states']) != STATES:
+            raise ValueError(f"Unsupported recording: {path}")
+        table = ProcessTable()
+        table.pids = data['pids'].tolist()
+        table.index = {pid: row for row, pid in enumerate(table.pids)}
+        for name, code in {**TABLE_COLUMNS, **IO_COLUMNS}.items():
+            setattr(table, name, to_array(code, data[name]))
+        table.state = bytearray(data['state'].tobytes())
+
+        cores = int(data['cores'])
+        timeline = Timeline(table.pids, cores)
+        for name, code in TIMELINE_COLUMNS.items():
+            setattr(timeline, name, to_array(code, data[name]))
+        timeline.event_states = bytearray(data['event_states'].tobytes())
+        link_events(timeline, data['event_rows'], len(table.pids))
+        table.timeline = timeline
+
+        optional = lambda name: None if np.isnan(data[name]) else float(data[name])
+        quanta = data['quanta'].tolist()
+        io_util = data['io_util'].tolist()
+        info = {
+            'algorithm': str(data['algorithm']),
+            'quantum': optional('quantum'),
+            'cores': cores,
+            'options': {'quanta': quanta or None, 'boost': optional('boost'), 'aging': float(data['aging'])},
+            'metrics': dict(zip(data['metric_names'].tolist(), data['metric_values'].tolist())),
+            'policy_metrics': dict(zip(data['policy_names'].tolist(), data['policy_values'].tolist())),
+            'io_metrics': {'io_util': io_util} if io_util else {},
+        }
+    return table, timeline, info
+
+
+def to_array(code, values):
+    column = array(code)
+    column.frombytes(np.ascontiguousarray(values, dtype=np.dtype(code)).tobytes())
+    return column
+
+
+def link_events(timeline, rows, count):
+    # Rebuild the timeline's links from each transition to the previous one
+    # of its row, and each of the `count` rows' last transition
+    order = np.argsort(rows, kind='stable')
+    ordered = rows[order]
+    same = ordered[1:] == ordered[:-1]
+    previous = np.full(len(rows), -1, dtype=np.int64)
+    previous[order[1:][same]] = order[:-1][same]
+    last = np.full(count, -1, dtype=np.int64)
+    ends = np.append(~same, True)[:len(rows)]  # Last transition of each row in `ordered`
+    last[ordered[ends]] = order[ends]
+    timeline.event_previous = to_array('q', previous)
+    timeline.row_events = to_array('q', last)
@@ -0,0 +1,611 @@
+"""Level-of-detail matplotlib renderers for the simulation views.
+
+However long the timeline, a view only has so many pixels. A renderer
+reduces the part of the run inside the current view, as set by the
+toolbar's pan and zoom, to one RGBA image with a column per pixel, and
+labels only the bars wide enough to hold their text. The image is rebuilt
+when the frame time, the view or the canvas size changes and is blitted
+over a cached background of the axes, so a frame costs about the same for
+ten processes or a million. The state view keeps the image of everything
+logged so far and only redraws the column under the frame time as it
+moves. Renderers only need a matplotlib Axes, so they
+work on the Agg backend as well as inside the Tk window.
+"""
+import math
+
+import matplotlib
+import numpy as np
+from matplotlib.colors import to_rgba, to_rgba_array
+from matplotlib.image import AxesImage
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from process_table import STATES, STATE_CODES
+from timeline import GanttSegments, Timeline
+
+CHAR_WIDTH = 0.6  # Average width of a label character, as a share of the font size
+LABEL_PADDING = 2  # Pixels kept clear on each side of a label
+MAX_LABELS = 200  # Most labels drawn in one view
+ROW_PIXELS = 10  # Image rows per process while every process has its own rows
+BAR_PIXELS = slice(1, 9)  # Of those, the rows a state bar fills (0.8 of the row, centred)
+
+NEW = STATE_CODES['New']
+TERMINATED = STATE_CODES['Terminated']
+
+
+def bucket(lanes, count, starts, ends, values, width):
+    """Spread intervals over pixel columns and return their weighted sums.
+
+    Interval i covers [starts[i], ends[i]] of lane lanes[i], in pixel
+    units within [0, width]. The result has shape (count, width, channels):
+    for each lane and column, the sum over intervals of values[i] times
+    the share of the column the interval covers.
+    """
+    size = width + 1
+    # An interval adds value * (x - start) to G(x) past its start and takes
+    # value * (x - end) back past its end, so a column's share is
+    # G(right edge) - G(left edge). Points are summed per edge and the
+    # sums accumulated along the lane.
+    points = np.clip(np.concatenate((starts, ends)), 0, width)  # Rounding can stray just outside
+    bins = np.concatenate((lanes, lanes)) * size + np.ceil(points).astype(np.int64)
+    edges = np.arange(size)
+    sums = np.empty((count, width, values.shape[1]))
+    for channel in range(values.shape[1]):
+        weights = np.concatenate((values[:, channel], -values[:, channel]))
+        total = np.bincount(bins, weights, count * size).reshape(count, size).cumsum(axis=1)
+        moment = np.bincount(bins, weights * points, count * size).reshape(count, size).cumsum(axis=1)
+        sums[:, :, channel] = np.diff(edges * total - moment, axis=1)
+    return sums
+
+
+def spans(lo, hi):
+    # Return the indices in [lo[i], hi[i]) for every i, one range after another
+    counts = hi - lo
+    return np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+
+def grow(column, size, capacity):
+    # Return `column` with room for `capacity` values, keeping the first `size`
+    grown = np.empty(capacity, dtype=column.dtype)
+    grown[:size] = column[:size]
+    return grown
+
+
+class LevelOfDetailRenderer:
+    """Base for renderers that draw the current view as one image of pixel columns.
+
+    Subclasses implement `build`, which returns the RGBA pixels of the view,
+    their extent in data coordinates and the (x, y, text) labels that fit.
+    The image, `overlays` and labels are animated artists drawn over a
+    background of the axes that is cached on every full redraw.
+    """
+
+    label_size = None  # Font size of labels; None for the default
+
+    def __init__(self, ax):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.background = None
+        self.time = None
+        self.view = None  # Limits, pixel size and time the image was built for
+        self.labels = []
+        self.overlays = []
+        self.image = self.add_image()
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def add_image(self):
+        image = AxesImage(self.ax, interpolation='nearest', origin='lower', animated=True)
+        image.set_clip_path(self.ax.patch)
+        self.ax.add_image(image)
+        return image
+
+    def clear(self):
+        """Remove everything drawn so far."""
+        self.ax.clear()
+        self.time = None
+        self.view = None
+        self.labels = []
+        self.overlays = []
+        self.image = self.add_image()
+
+    def on_draw(self, event):
+        # A full redraw (first frame, resize, pan/zoom) refreshes the background
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        if self.time is not None:
+            self.update_view()
+            self.draw_live()
+
+    def render(self, state):
+        """Draw the frame described by a Timeline.frame() dict."""
+        self.time = state['time']
+        self.update(state)
+        self.canvas.restore_region(self.background)
+        self.update_view()
+        self.draw_live()
+        self.canvas.blit(self.ax.bbox)
+
+    def update(self, state):
+        """Take in the data added by the frame `state`."""
+
+    def update_view(self):
+        # Rebuild the image and labels only when the view or the time changed
+        bbox = self.ax.bbox
+        width, height = max(int(round(bbox.width)), 1), max(int(round(bbox.height)), 1)
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        view = (x0, x1, y0, y1, width, height, self.time)
+        if view == self.view:
+            return
+        self.view = view
+        for label in self.labels:
+            label.remove()
+        self.labels = []
+        if x1 <= x0 or y1 <= y0:
+            self.image.set_visible(False)
+            return
+        pixels, extent, labels = self.build(x0, x1, y0, y1, width, height)
+        self.image.set_visible(pixels is not None)
+        if pixels is not None:
+            self.image.set_data(pixels)
+            self.image.set_extent(extent)
+        self.labels = [self.ax.text(x, y, text, ha='center', va='center', fontsize=self.label_size,
+                                    animated=True, clip_on=True)
+                       for x, y, text in labels]
+
+    def build(self, x0, x1, y0, y1, width, height):
+        """Return (pixels, extent, labels) for the view; pixels may be None when empty.
+
+        Pixels are opaque, as `opaque` returns them.
+        """
+        raise NotImplementedError
+
+    def opaque(self, pixels):
+        """Return RGBA `pixels` blended with the axes colour, as 8-bit RGB."""
+        # Resampling a translucent image leaves dark fringes, so partly
+        # covered pixels take the axes colour here
+        share = pixels[..., 3:]
+        face = to_rgba(self.ax.get_facecolor())[:3]
+        rgb = pixels[..., :3] * share + np.multiply(face, 1 - share)
+        return (rgb * 255 + 0.5).astype(np.uint8)
+
+    def char_width(self):
+        # Approximate pixel width of one label character
+        size = self.label_size or matplotlib.rcParams['font.size']
+        return size * self.ax.figure.dpi / 72 * CHAR_WIDTH
+
+    def draw_live(self):
+        if self.view is None:
+            return
+        if self.image.get_visible():
+            self.ax.draw_artist(self.image)
+        for artist in self.overlays + self.labels:
+            self.ax.draw_artist(artist)
+
+
+class GanttLane:
+    """One core's Gantt segments in time order, with the busy time before each."""
+
+    def __init__(self):
+        self.size = 0
+        self.starts = np.empty(0)
+        self.ends = np.empty(0)  # NaN while the segment runs
+        self.before = np.empty(0)  # Busy time of the lane before each segment
+        self.indices = np.empty(0, dtype=np.int64)  # Position in the renderer's gantt_data
+        self.colors = np.empty(0, dtype=np.int64)  # Palette entries
+        self.longest = 0  # Longest finished segment
+
+    def append(self, starts, ends, indices, colors):
+        size, count = self.size, len(starts)
+        if size + count > len(self.starts):
+            capacity = max(2 * len(self.starts), size + count, 64)
+            for name in ('starts', 'ends', 'before', 'indices', 'colors'):
+                setattr(self, name, grow(getattr(self, name), size, capacity))
+        # Only a lane's last segment can still be running, so every earlier
+        # one has a length by now
+        total = self.before[size - 1] + self.ends[size - 1] - self.starts[size - 1] if size else 0.0
+        lengths = ends - starts
+        self.before[size:size + count] = total + np.concatenate(([0.0], np.cumsum(lengths[:-1])))
+        self.starts[size:size + count] = starts
+        self.ends[size:size + count] = ends
+        self.indices[size:size + count] = indices
+        self.colors[size:size + count] = colors
+        self.size += count
+        self.longest = max(self.longest, np.nanmax(lengths, initial=0))
+
+    def close(self, gantt_data):
+        # Pick up the end of the last segment if it has finished since
+        last = self.size - 1
+        if last >= 0 and self.ends[last] != self.ends[last]:
+            end = gantt_data[self.indices[last]]['end']
+            if end is not None:
+                self.ends[last] = end
+                self.longest = max(self.longest, end - self.starts[last])
+
+    def busy(self, times):
+        """Return the busy time up to each of `times`, and the last segment started by each (-1 if none)."""
+        starts = self.starts[:self.size]
+        last = np.searchsorted(starts, times, 'right') - 1
+        i = np.maximum(last, 0)
+        ends = self.ends[i]
+        ends = np.where(ends == ends, ends, times)  # A running segment counts up to the time
+        busy = self.before[i] + np.clip(np.minimum(times, ends) - starts[i], 0, None)
+        return np.where(last >= 0, busy, 0.0), last
+
+
+class GanttRenderer(LevelOfDetailRenderer):
+    """Draws Gantt segments onto `ax`, one lane per core.
+
+    Each pixel column of a lane takes the colour of the last segment that
+    started in it, shaded by the share of the column the core was busy, so
+    segments too short to see still show how busy the core was. Segments
+    are taken in as frames reach them.
+    """
+
+    def __init__(self, ax):
+        super().__init__(ax)
+        self.gantt_data = []
+        self.color_map = {}
+        self.end_time = 0
+        self.cores = 1
+        self.start = 0
+        self.started = 0  # Segments taken in so far
+        self.lanes = [GanttLane()]
+        self.palette = {}  # Color -> palette entry
+        self.row_colors = None  # Palette entry of each timeline row
+
+    def reset(self, gantt_data, color_map, end_time, cores=1, start=0):
+        """Clear the axes and prepare to draw `gantt_data` from `start` up to `end_time`."""
+        self.clear()
+        self.gantt_data = gantt_data
+        self.color_map = color_map
+        self.end_time = end_time
+        self.cores = cores
+        self.start = start
+        self.lanes = [GanttLane() for _ in range(cores)]
+        self.palette = {}
+        self.row_colors = None
+        self.ax.set_ylim(0, cores)
+        # Initial limits; the toolbar's home button returns to them
+        self.ax.set_xlim(start, end_time + 1)
+        self.ax.set_title("Gantt Chart")
+        if cores > 1:
+            self.ax.set_yticks([core + 0.5 for core in range(cores)])
+            self.ax.set_yticklabels([f"CPU {core}" for core in range(cores)])
+            self.overlays = [self.ax.axhline(core, color='white', linewidth=2, animated=True)
+                             for core in range(1, cores)]
+        else:
+            self.ax.set_yticks([])
+        self.canvas.draw()
+
+    def clear(self):
+        super().clear()
+        self.started = 0
+        self.lanes = [GanttLane() for _ in range(self.cores)]
+
+    def update(self, state):
+        gantt_end = state['gantt_end']
+        for lane in self.lanes:
+            lane.close(self.gantt_data)
+        if gantt_end <= self.started:
+            return
+        starts, ends, cores, colors = self.read(self.started, gantt_end)
+        indices = np.arange(self.started, gantt_end)
+        if self.cores == 1:
+            self.lanes[0].append(starts, ends, indices, colors)
+        else:
+            for core, lane in enumerate(self.lanes):
+                on_core = cores == core
+                if on_core.any():
+                    lane.append(starts[on_core], ends[on_core], indices[on_core], colors[on_core])
+        self.started = gantt_end
+
+    def read(self, first, end):
+        # Return starts, ends (NaN while running), cores and palette entries of segments [first, end)
+        if isinstance(self.gantt_data, GanttSegments):
+            # Straight from the timeline's columns; slicing copies them, so the
+            # scheduler can keep appending on its thread
+            timeline = self.gantt_data.timeline
+            rows = np.frombuffer(timeline.segment_rows[first:end], dtype=np.int64)
+            if self.row_colors is None or len(self.row_colors) < len(timeline.pids):
+                self.row_colors = self.palette_entries([self.color_map[pid] for pid in timeline.pids])
+            return (np.frombuffer(timeline.segment_starts[first:end], dtype=np.float64),
+                    np.frombuffer(timeline.segment_ends[first:end], dtype=np.float64),
+                    np.frombuffer(timeline.segment_cores[first:end], dtype=np.int64),
+                    self.row_colors[rows])
+        entries = self.gantt_data[first:end]
+        return (np.array([entry['start'] for entry in entries], dtype=np.float64),
+                np.array([np.nan if entry['end'] is None else entry['end'] for entry in entries],
+                         dtype=np.float64),
+                np.array([entry.get('core', 0) for entry in entries], dtype=np.int64),
+                self.palette_entries([self.color_map[entry['pid']] for entry in entries]))
+
+    def palette_entries(self, colors):
+        palette = self.palette
+        return np.array([palette.setdefault(color, len(palette)) for color in colors], dtype=np.int64)
+
+    def build(self, x0, x1, y0, y1, width, height):
+        if not self.palette:
+            return None, None, []
+        time = self.time
+        scale = (x1 - x0) / width  # Time units per pixel
+        edges = np.minimum(np.linspace(x0, x1, width + 1), time)
+        colors = to_rgba_array(list(self.palette))
+        pixels = np.zeros((self.cores, width, 4))
+        for core, lane in enumerate(self.lanes):
+            if not lane.size:
+                continue
+            busy, last = lane.busy(edges)
+            share = np.diff(busy) / scale
+            # The last segment started by a column's right edge overlaps it
+            # whenever the core was busy in it
+            filled = share > 0
+            pixels[core, filled, :3] = colors[lane.colors[last[1:][filled]], :3]
+            pixels[core, filled, 3] = np.minimum(share[filled], 1)
+        return self.opaque(pixels), (x0, x1, 0, self.cores), self.fitting_labels(x0, x1, scale)
+
+    def fitting_labels(self, x0, x1, scale):
+        # Label the segments whose visible part is wide enough for their pid
+        char = self.char_width()
+        right = min(x1, self.time)
+        labels = []
+        for core, lane in enumerate(self.lanes):
+            if lane.size == 0 or max(lane.longest, right - lane.starts[lane.size - 1]) < (
+                    char + 2 * LABEL_PADDING) * scale:
+                continue  # Nothing on this lane is wide enough at this zoom
+            starts = lane.starts[:lane.size]
+            first = max(np.searchsorted(starts, x0, 'right') - 1, 0)
+            end = np.searchsorted(starts, right, 'left')
+            ends = lane.ends[first:end]
+            left = np.maximum(starts[first:end], x0)
+            stop = np.minimum(np.where(ends == ends, ends, right), right)
+            pixels = (stop - left) / scale
+            for i in np.flatnonzero(pixels >= char + 2 * LABEL_PADDING):
+                pid = self.gantt_data[lane.indices[first + i]]['pid']
+                if len(pid) * char + 2 * LABEL_PADDING <= pixels[i]:
+                    labels.append(((left[i] + stop[i]) / 2, core + 0.5, pid))
+                    if len(labels) == MAX_LABELS:
+                        return labels
+        return labels
+
+
+class TransitionIndex:
+    """A timeline's state transitions grouped by row, for reading the rows in view.
+
+    The log is taken in as chunks, each a copy of its transitions sorted
+    stably by row, so a row's part of a chunk is in time order. A chunk is
+    merged into the one before once it is at least half its size, which
+    keeps O(log n) chunks however the log grows. Every row starts New at
+    time 0, before its first logged transition.
+    """
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self.size = 0  # Transitions taken in
+        self.horizon = -math.inf  # Time of the last one
+        self.chunks = []  # (rows, times, states), sorted by row
+
+    def extend(self):
+        """Take in the transitions logged since the last call; return whether there were any."""
+        timeline = self.timeline
+        # The state code is appended last, so its length counts the
+        # transitions fully written by the scheduler's thread
+        end = len(timeline.event_states)
+        if end <= self.size:
+            return False
+        rows = np.frombuffer(timeline.event_rows[self.size:end], dtype=np.int64)
+        order = np.argsort(rows, kind='stable')
+        chunks = self.chunks
+        chunks.append((rows[order],
+                       np.frombuffer(timeline.event_times[self.size:end], dtype=np.float64)[order],
+                       np.frombuffer(timeline.event_states[self.size:end], dtype=np.uint8)[order]))
+        while len(chunks) > 1 and 2 * len(chunks[-1][0]) >= len(chunks[-2][0]):
+            # The earlier chunk comes first, so a stable sort keeps each row in time order
+            later = chunks.pop()
+            merged = [np.concatenate(columns) for columns in zip(chunks[-1], later)]
+            order = np.argsort(merged[0], kind='stable')
+            chunks[-1] = tuple(column[order] for column in merged)
+        self.size = end
+        self.horizon = timeline.event_times[end - 1]
+        return True
+
+    def transitions(self, rows):
+        """Return (lanes, times, states) of the transitions of `rows`, sorted by lane then time.
+
+        `rows` is sorted, and lane i holds the transitions of rows[i].
+        """
+        lanes = [np.arange(len(rows))]
+        times = [np.zeros(len(rows))]
+        states = [np.full(len(rows), NEW, dtype=np.uint8)]
+        for chunk_rows, chunk_times, chunk_states in self.chunks:
+            lo = np.searchsorted(chunk_rows, rows, 'left')
+            hi = np.searchsorted(chunk_rows, rows, 'right')
+            found = spans(lo, hi)
+            lanes.append(np.repeat(np.arange(len(rows)), hi - lo))
+            times.append(chunk_times[found])
+            states.append(chunk_states[found])
+        lanes = np.concatenate(lanes)
+        # Chunks are in log order, so a stable sort keeps each lane in time order
+        order = np.argsort(lanes, kind='stable')
+        return lanes[order], np.concatenate(times)[order], np.concatenate(states)[order]
+
+
+class HistoryIndex:
+    """The same lookups as TransitionIndex over processes' 'state_times'/'state_names' lists."""
+
+    horizon = math.inf  # The lists are taken in whole
+
+    def __init__(self, processes):
+        counts, times, states = [], [], []
+        for p in processes:
+            counts.append(len(p['state_times']))
+            times.extend(p['state_times'])
+            states.extend(STATE_CODES[name] for name in p['state_names'])
+        self.offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+        self.times = np.array(times, dtype=np.float64)
+        self.states = np.array(states, dtype=np.uint8)
+
+    def extend(self):
+        return False
+
+    def transitions(self, rows):
+        lo, hi = self.offsets[rows], self.offsets[rows + 1]
+        found = spans(lo, hi)
+        return np.repeat(np.arange(len(rows)), hi - lo), self.times[found], self.states[found]
+
+
+class StateRenderer(LevelOfDetailRenderer):
+    """Draws one row of state bars per process.
+
+    Transitions come from the timeline of a ProcessTable, or else from each
+    process's 'state_times'/'state_names' lists; a process's last state
+    lasts up to the frame time, or one time unit once it is Terminated.
+    While every visible process fits in its own pixel rows, it gets a bar
+    0.8 of a row tall, and each pixel column blends the colours of the
+    states in it by how long they lasted there. With more processes than
+    pixel rows, evenly spaced ones stand in for the rest.
+
+    The image of a view is built once from every transition logged so
+    far, with the last states running on to the right edge. Columns before
+    the frame time are the same at any later time, so a frame copies them,
+    rebuilds the column the time falls in and leaves the rest empty. The
+    image is built again when the view changes, or when the frame time
+    passes the last transition taken in and the log has grown.
+    """
+
+    label_size = 8
+
+    def __init__(self, ax):
+        super().__init__(ax)
+        self.processes = []
+        self.state_colors = {}
+        self.end_time = 0
+        self.start = 0
+        self.index = None
+        self.cache = None
+
+    def reset(self, processes, state_colors, end_time, start=0):
+        """Clear the axes and prepare to draw the states of `processes` from `start` up to `end_time`."""
+        self.clear()
+        self.processes = processes
+        self.state_colors = state_colors
+        self.end_time = end_time
+        self.start = start
+        self.index = None
+        self.ax.set_title("Process States")
+        self.ax.set_ylim(-0.5, len(processes) - 0.5)
+        self.ax.set_xlim(start, end_time + 1)
+        # Pids of as many rows as the axis has room for
+        self.ax.yaxis.set_major_locator(MaxNLocator(nbins='auto', integer=True))
+        self.ax.yaxis.set_major_formatter(FuncFormatter(self.row_label))
+        self.canvas.draw()
+
+    def clear(self):
+        super().clear()
+        self.cache = None
+
+    def row_label(self, y, position):
+        row = int(round(y))
+        if row != y or not 0 <= row < len(self.processes):
+            return ""
+        return self.processes[row]['pid']
+
+    def transitions(self):
+        # The index of the processes' transitions, made on first use and
+        # again if the table has been simulated since
+        timeline = getattr(self.processes, 'timeline', None)
+        if isinstance(timeline, Timeline):
+            if self.index is None or self.index.timeline is not timeline:
+                self.index = TransitionIndex(timeline)
+                self.cache = None
+        elif self.index is None:
+            self.index = HistoryIndex(self.processes)
+        return self.index
+
+    def build(self, x0, x1, y0, y1, width, height):
+        index = self.transitions()
+        if self.time > index.horizon and index.extend():
+            self.cache = None
+        view = (x0, x1, y0, y1, width, height)
+        if self.cache is None or self.cache['view'] != view:
+            self.cache = self.build_view(index, *view)
+        cache = self.cache
+        if cache['pixels'] is None:
+            return None, None, []
+        # The frame time in pixels from the left edge
+        cursor = min((self.time - x0) / cache['scale'], width)
+        if cursor <= 0:
+            return None, None, []
+        full = int(cursor)
+        pixels = cache['empty'].copy()
+        pixels[:, :full] = cache['pixels'][:, :full]
+        if full < width:
+            # The column the time falls in only shows up to the time
+            starts = np.clip(cache['starts'], full, cursor) - full
+            ends = np.clip(cache['ends'], full, cursor) - full
+            pixels[:, full:full + 1] = self.paint(cache, starts, ends, 1)
+        return pixels, cache['extent'], self.fitting_labels(cache, cursor)
+
+    def build_view(self, index, x0, x1, y0, y1, width, height):
+        # The intervals of the view's rows, in pixels, and its image up to the right edge
+        first = max(math.floor(y0 + 0.5), 0)
+        end = min(math.ceil(y1 + 0.5), len(self.processes))
+        view = {'view': (x0, x1, y0, y1, width, height), 'pixels': None}
+        if end <= first:
+            return view
+        count = end - first
+        whole = count <= height
+        rows = np.arange(first, end) if whole else first + np.arange(height) * count // height
+        lanes, starts, states = index.transitions(rows)
+        # Each state lasts until the lane's next transition; the last one
+        # runs on, or lasts one time unit once Terminated
+        ends = np.full(len(starts), math.inf)
+        followed = lanes[1:] == lanes[:-1]
+        ends[:-1][followed] = starts[1:][followed]
+        ends[:-1][~followed & (states[:-1] == TERMINATED)] = starts[:-1][~followed & (states[:-1] == TERMINATED)] + 1
+        if len(states) and states[-1] == TERMINATED:
+            ends[-1] = starts[-1] + 1
+        visible = (starts < x1) & (ends > x0)
+        scale = (x1 - x0) / width
+        colors = to_rgba_array([self.state_colors[name] for name in STATES])
+        colors[:, 3] = 1  # Weight of each interval, to give the covered share
+        view.update({
+            'scale': scale,
+            'whole': whole,
+            'count': len(rows),
+            'first': first,
+            'extent': (x0, x1, first - 0.5, end - 0.5),
+            'lanes': lanes[visible],
+            'starts': (np.maximum(starts[visible], x0) - x0) / scale,
+            'ends': (np.minimum(ends[visible], x1) - x0) / scale,
+            'states': states[visible],
+            'colors': colors,
+        })
+        view['pixels'] = self.paint(view, view['starts'], view['ends'], width)
+        view['empty'] = self.opaque(np.zeros(view['pixels'].shape[:2] + (4,)))
+        return view
+
+    def paint(self, view, starts, ends, width):
+        # Return the opaque pixels of `width` columns covering [0, width] of the given intervals
+        sums = bucket(view['lanes'], view['count'], starts, ends, view['colors'][view['states']], width)
+        share = sums[:, :, 3:]
+        sums[:, :, :3] /= np.where(share > 0, share, 1)
+        np.clip(sums, 0, 1, out=sums)  # Rounding can stray just outside
+        if not view['whole']:
+            return self.opaque(sums)
+        pixels = np.zeros((view['count'], ROW_PIXELS, width, 4))
+        pixels[:, BAR_PIXELS] = sums[:, np.newaxis]
+        return self.opaque(pixels.reshape(view['count'] * ROW_PIXELS, width, 4))
+
+    def fitting_labels(self, view, cursor):
+        # Label the intervals wide enough for their state, in rows tall enough for text
+        char = self.char_width()
+        if not view['whole'] or view['view'][5] / view['count'] * 0.8 < char / CHAR_WIDTH:
+            return []
+        starts = view['starts']
+        ends = np.minimum(view['ends'], cursor)
+        states = view['states']
+        needed = np.array([len(name) * char + 2 * LABEL_PADDING for name in STATES])[states]
+        labels = []
+        x0, scale = view['view'][0], view['scale']
+        for i in np.flatnonzero((starts < cursor) & (ends - starts >= needed))[:MAX_LABELS]:
+            labels.append((x0 + (starts[i] + ends[i]) / 2 * scale, view['first'] + view['lanes'][i],
+                           STATES[states[i]]))
+        return labels
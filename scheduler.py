@@ -0,0 +1,635 @@
+"""CPU scheduling engine used by the visualizer and by headless batch runs.
+
+This module is pure Python: importing it does not pull in tkinter or
+matplotlib, so it can be used on display-less machines.
+
+    from scheduler import make_process, simulate
+    result = simulate([make_process("P0", 0, 5), make_process("P1", 1, 3)], "RR", quantum=2)
+    print(result['metrics']['avg_tat'])
+"""
+import heapq
+from array import array
+from bisect import bisect_right
+
+from io_devices import make_devices
+from process_table import ProcessTable, STATES, STATE_CODES
+from ready_queue import AgingQueue, make_ready_queue
+from timeline import Timeline
+
+ALGORITHMS = ["FCFS", "SJF", "RR", "Priority", "SRTF", "MLFQ"]
+MLFQ_LEVELS = 3  # Default MLFQ levels, each with twice the quantum of the one above
+MLFQ_QUANTUM = 2  # Default quantum of the top MLFQ level
+
+TERMINATED = STATE_CODES['Terminated']
+PROGRESS_INTERVAL = 1000  # Events between progress reports and cancellation checks
+
+
+class SimulationCancelled(Exception):
+    """Raised by Scheduler.run when its should_stop callback asks it to stop."""
+
+
+def make_process(pid, arrival, burst, priority=0, devices=None):
+    """Create a process record in the format the scheduler and GUI share.
+
+    `burst` may be a sequence of CPU and I/O bursts with the `devices` of
+    the I/O ones, as ProcessTable.add takes.
+    """
+    return {
+        'pid': pid, 'arrival': arrival, 'burst': burst, 'priority': priority, 'devices': devices,
+        'remaining': burst, 'state': 'New',
+        'state_times': [0], 'state_names': ['New'],
+        'first_run': None, 'completion': None
+    }
+
+
+def state_at(process, time):
+    """Return the state `process` was in at `time`."""
+    # state_times is sorted, so the last transition at or before `time` wins
+    i = bisect_right(process['state_times'], time)
+    return process['state_names'][i - 1] if i else 'New'
+
+
+class Scheduler:
+    """Discrete-event simulation of `cores` CPUs under one scheduling algorithm.
+
+    `processes` is a ProcessTable, or a list of process dicts; dicts are
+    copied into a table for the run and get their results written back
+    afterwards. `ready_queue` overrides the queue structure normally picked
+    for the algorithm by ready_queue.make_ready_queue; with several cores
+    it is shared by all of them.
+
+    MLFQ takes one quantum per level in `quanta` (by default MLFQ_LEVELS
+    levels starting from `quantum`, each twice the one above) and moves
+    every process back to the top level every `boost` time units if set.
+    Priority raises a waiting process's priority by `aging` per time unit.
+
+    Processes with burst sequences block in the Waiting state for each I/O
+    burst, at the device it names. `devices` is a list of io_devices
+    models indexed by device number, used for one run; by default each
+    device number gets a single-channel io_devices.Device.
+    """
+
+    def __init__(self, processes, algorithm="FCFS", quantum=None, ready_queue=None, cores=1,
+                 quanta=None, boost=None, aging=0, devices=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if cores < 1:
+            raise ValueError("Core count must be at least 1")
+        if algorithm == "RR":
+            if quantum is None or quantum <= 0:
+                raise ValueError("Quantum must be greater than zero")
+        elif algorithm == "MLFQ":
+            if quanta is None:
+                base = MLFQ_QUANTUM if quantum is None else quantum
+                quanta = [base * 2 ** level for level in range(MLFQ_LEVELS)]
+            quanta = list(quanta)
+            if not quanta or min(quanta) <= 0:
+                raise ValueError("Quantum must be greater than zero")
+            if boost is not None and boost <= 0:
+                raise ValueError("Boost period must be greater than zero")
+            if cores > 1:
+                raise ValueError("MLFQ runs on a single core")
+        else:
+            quantum = None
+        if algorithm != "MLFQ":
+            quanta = boost = None
+        if aging < 0:
+            raise ValueError("Aging rate cannot be negative")
+        if algorithm != "Priority":
+            aging = 0
+
+        if isinstance(processes, ProcessTable):
+            self.records = None
+            self.table = processes
+        else:
+            self.records = list(processes)
+            self.table = ProcessTable.from_records(self.records)
+
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.cores = cores
+        self.quanta = quanta
+        self.boost = boost
+        self.aging = aging
+        self.all_processes = self.records if self.records is not None else self.table
+
+        # Reset per-run fields so the same table can be simulated again
+        self.table.reset()
+
+        # I/O: each row's cursor into table.phases at its current CPU burst,
+        # when it last blocked, and a heap of (end time, device, row) per
+        # burst being served
+        table = self.table
+        self.io = len(table.phases) > 0
+        if self.io:
+            needed = max(table.phase_devices) + 1
+            if devices is None:
+                devices = make_devices(needed)
+            elif len(devices) < needed:
+                raise ValueError(f"I/O burst uses device {needed - 1} but only {len(devices)} devices were given")
+        self.devices = list(devices or ())
+        self.phase = table.phase_offsets[:-1]
+        self.waiting_since = array('d', [0.0]) * len(table)
+        self.io_events = []
+
+        self.current_time = 0
+        self.timeline = Timeline(self.table.pids, cores)
+        self.table.timeline = self.timeline
+        self.gantt_data = self.timeline.gantt_data
+        # MLFQ: each row's level and the CPU time it has used there
+        self.level = array('q', [0]) * len(self.table)
+        self.used = array('d', [0.0]) * len(self.table)
+        self.next_boost = boost
+        self.demotions = 0
+        self.boosts = 0
+        if ready_queue is None:
+            ready_queue = make_ready_queue(algorithm, self.table, aging, lambda: self.current_time,
+                                           len(quanta or ()), self.level.__getitem__)
+        self.ready_queue = ready_queue
+        self.running_process = None  # Row of the process on the CPU (single core)
+        self.running = [None] * cores  # Row of the process on each core (several cores)
+        self.arrivals = sorted(range(len(self.table)), key=self.table.arrival.__getitem__)
+        self.arrival_index = 0  # Cursor into self.arrivals; everything before it is admitted
+        self.execution_order = []
+        self.time_slice = 0  # Track how long the current process has been running
+        self.finished = 0  # Processes terminated so far
+
+    def makespan(self):
+        """Return the time the last process will finish, or a bound on it.
+
+        All the algorithms keep the CPU busy whenever a process is ready, so
+        on one core without I/O the end time is the same for every one of
+        them and is known before the run. On several cores it depends on
+        the algorithm, but no core idles while a process waits, so the last
+        process is done within (total burst / cores + longest burst) of the
+        last arrival. With I/O, some CPU or device is always busy while a
+        process is unfinished, so running the processes one after another,
+        I/O included, bounds the end time.
+        """
+        table = self.table
+        arrival, burst = table.arrival, table.burst
+        if self.io:
+            phases, offsets = table.phases, table.phase_offsets
+            burst = [burst[row] + sum(phases[offsets[row] + 1:offsets[row + 1]:2])
+                     for row in range(len(burst))]
+        time = 0
+        for row in self.arrivals:
+            time = max(time, arrival[row]) + burst[row]
+        if self.cores > 1 and len(burst) and not self.io:
+            last = arrival[self.arrivals[-1]]
+            time = min(time, last + sum(burst) / self.cores + max(burst))
+        return time
+
+    def run(self, progress=None, should_stop=None):
+        """Run the simulation to completion and return the scheduler.
+
+        The timeline can be read from another thread while this runs. Every
+        PROGRESS_INTERVAL events, `progress(finished, total)` is called and
+        SimulationCancelled is raised if `should_stop()` returns true.
+        """
+        if self.cores > 1:
+            return self.run_cores(progress, should_stop)
+        table = self.table
+        remaining = table.remaining
+        srtf = self.algorithm == "SRTF"
+        round_robin = self.algorithm == "RR"
+        mlfq = self.algorithm == "MLFQ"
+        io = self.io
+        io_events = self.io_events
+        last_phase = table.phase_offsets[1:]
+        events = 0
+        # Discrete-event loop: time jumps straight to the next arrival, I/O
+        # completion, CPU burst completion or quantum expiry instead of
+        # advancing one unit per iteration.
+        while (self.arrival_index < len(self.arrivals) or self.ready_queue
+               or self.running_process is not None or io_events):
+            events += 1
+            if events % PROGRESS_INTERVAL == 0:
+                self.report(progress, should_stop)
+
+            if io:
+                self.finish_io()
+            self.admit_arrivals()
+
+            # SRTF preemption, Round Robin quantum expiry and MLFQ level changes
+            if srtf:
+                self.check_preemption()
+            elif round_robin:
+                self.check_quantum()
+            elif mlfq:
+                self.check_levels()
+
+            # Select next process if CPU is idle
+            if self.running_process is None and self.ready_queue:
+                self.select_next_process()
+                self.time_slice = 0  # Reset time slice for new process
+
+            # Mark an animation frame at the current end of the logs
+            self.timeline.mark_frame(self.current_time)
+
+            # Next event: the earliest of the next arrival or I/O completion,
+            # the running process's burst completion and (for RR) its quantum expiry
+            next_event = self.next_arrival_time()
+            if io_events and (next_event is None or io_events[0][0] < next_event):
+                next_event = io_events[0][0]
+            row = self.running_process
+            if row is None:
+                if next_event is None:
+                    break
+                self.current_time = next_event
+                continue
+
+            if not table.is_set(table.first_run, row):
+                table.first_run[row] = self.current_time
+
+            step_time = remaining[row]
+            if round_robin:
+                step_time = min(step_time, self.quantum - self.time_slice)
+            elif mlfq:
+                step_time = min(step_time, self.quanta[self.level[row]] - self.used[row])
+                if self.boost is not None:
+                    step_time = min(step_time, self.next_boost - self.current_time)
+            if next_event is not None:
+                step_time = min(step_time, next_event - self.current_time)
+            finished = step_time >= remaining[row]
+
+            remaining[row] -= step_time
+            self.time_slice += step_time
+            if mlfq:
+                self.used[row] += step_time
+            self.current_time += step_time
+
+            # Burst completion: the process blocks for its next I/O burst or terminates
+            if finished:
+                remaining[row] = 0
+                if io and self.phase[row] < last_phase[row] - 1:
+                    self.start_io(row)
+                else:
+                    table.completion[row] = self.current_time
+                    self.set_state(row, 'Terminated')
+                    self.finished += 1
+                self.running_process = None
+                self.time_slice = 0  # Reset time slice
+
+        return self.finish(progress)
+
+    def run_cores(self, progress=None, should_stop=None):
+        """Run the simulation on several cores sharing one ready queue; see run.
+
+        Each busy core has one pending event, the completion or quantum
+        expiry of its process, in a heap ordered by time, and idle cores
+        wait in a heap of their own, so an event costs O(log cores) however
+        many cores there are. SRTF keeps the running processes in a heap
+        by finish time: the one finishing last has the most time left and
+        is the one a shorter arrival preempts.
+        """
+        table = self.table
+        remaining = table.remaining
+        running = self.running
+        srtf = self.algorithm == "SRTF"
+        io = self.io
+        io_events = self.io_events
+        last_phase = table.phase_offsets[1:]
+        self.idle = list(range(self.cores))  # Heap of idle cores, lowest first
+        self.pending = []  # Heap of (time, core, dispatch number, completes) per busy core
+        self.finishing = []  # SRTF: heap of (-finish time, core, dispatch number), compacted in dispatch
+        self.dispatch_count = [0] * self.cores  # Stale heap entries carry an old number
+        self.dispatched_at = [0.0] * self.cores
+        events = 0
+        while (self.arrival_index < len(self.arrivals) or self.ready_queue
+               or len(self.idle) < self.cores or io_events):
+            events += 1
+            if events % PROGRESS_INTERVAL == 0:
+                self.report(progress, should_stop)
+
+            # Processes whose run ends now leave their cores: completions
+            # first, then I/O completions and arrivals are admitted, then
+            # expired quanta requeue
+            expired = []
+            pending = self.pending
+            while pending and pending[0][0] <= self.current_time:
+                _, core, number, completes = heapq.heappop(pending)
+                if number != self.dispatch_count[core]:
+                    continue  # Preempted before this event came up
+                row = running[core]
+                running[core] = None
+                heapq.heappush(self.idle, core)
+                if completes:
+                    remaining[row] = 0
+                    if io and self.phase[row] < last_phase[row] - 1:
+                        self.start_io(row)
+                    else:
+                        table.completion[row] = self.current_time
+                        self.set_state(row, 'Terminated')
+                        self.finished += 1
+                else:
+                    remaining[row] -= self.quantum
+                    expired.append(row)
+
+            if io:
+                self.finish_io()
+            self.admit_arrivals()
+            for row in expired:
+                self.set_state(row, 'Ready')
+                self.ready_queue.push(row)
+
+            while self.idle and self.ready_queue:
+                self.dispatch(self.ready_queue.pop(), heapq.heappop(self.idle))
+
+            if srtf:
+                self.preempt_cores()
+
+            self.timeline.mark_frame(self.current_time)
+
+            # Next event: the earliest of the next arrival, I/O completion and core event
+            while pending and pending[0][2] != self.dispatch_count[pending[0][1]]:
+                heapq.heappop(pending)
+            next_time = self.next_arrival_time()
+            if io_events and (next_time is None or io_events[0][0] < next_time):
+                next_time = io_events[0][0]
+            if pending and (next_time is None or pending[0][0] < next_time):
+                next_time = pending[0][0]
+            if next_time is None:
+                break
+            self.current_time = next_time
+
+        return self.finish(progress)
+
+    def dispatch(self, row, core):
+        """Start the process in `row` on an idle `core` and schedule its next event."""
+        table = self.table
+        self.dispatch_count[core] += 1
+        self.running[core] = row
+        self.dispatched_at[core] = self.current_time
+        self.set_state(row, 'Running', core=core)
+        if not table.is_set(table.first_run, row):
+            table.first_run[row] = self.current_time
+
+        step = table.remaining[row]
+        completes = True
+        if self.algorithm == "RR" and self.quantum < step:
+            step = self.quantum
+            completes = False
+        number = self.dispatch_count[core]
+        heapq.heappush(self.pending, (self.current_time + step, core, number, completes))
+        if self.algorithm == "SRTF":
+            finishing = self.finishing
+            heapq.heappush(finishing, (-(self.current_time + table.remaining[row]), core, number))
+            if len(finishing) > 2 * self.cores:
+                # Entries of ended runs sink below the live ones and are never
+                # popped, so drop them once they outnumber the running cores
+                finishing[:] = [entry for entry in finishing
+                                if entry[2] == self.dispatch_count[entry[1]] and self.running[entry[1]] is not None]
+                heapq.heapify(finishing)
+
+    def preempt_cores(self):
+        """SRTF: swap ready processes with less time left for the running ones with the most."""
+        remaining = self.table.remaining
+        finishing = self.finishing
+        while self.ready_queue and finishing:
+            finish, core, number = finishing[0]
+            if number != self.dispatch_count[core]:
+                heapq.heappop(finishing)  # That run already ended
+                continue
+            candidate = self.ready_queue.peek()
+            left = -finish - self.current_time
+            if remaining[candidate] >= left:
+                break
+            heapq.heappop(finishing)
+            self.ready_queue.pop()
+            victim = self.running[core]
+            remaining[victim] = left
+            self.set_state(victim, 'Ready')
+            self.ready_queue.push(victim)
+            self.dispatch(candidate, core)
+
+    def report(self, progress, should_stop):
+        # Called every PROGRESS_INTERVAL events
+        if should_stop is not None and should_stop():
+            raise SimulationCancelled()
+        if progress is not None:
+            progress(self.finished, len(self.table))
+
+    def finish(self, progress=None):
+        """Close the run once no events are left and return the scheduler."""
+        table = self.table
+        # Ensure all processes are properly terminated after simulation
+        for row in range(len(table)):
+            if not table.is_set(table.completion, row):
+                # Process didn't complete during simulation
+                table.completion[row] = self.current_time
+                self.set_state(row, 'Terminated')
+            elif table.state[row] != TERMINATED:
+                # Process completed but state wasn't set properly
+                self.set_state(row, 'Terminated', table.completion[row])
+
+        # Add one final frame to ensure all terminations are visible
+        self.timeline.mark_frame(self.current_time)
+        self.execution_order = self.timeline.execution_order()
+        if self.records is not None:
+            self.write_back()
+        if progress is not None:
+            progress(len(table), len(table))
+        return self
+
+    def write_back(self):
+        """Copy the run's results from the table into the input process dicts."""
+        table = self.table
+        for row, p in enumerate(self.records):
+            p.setdefault('priority', 0)
+            p['remaining'] = table.remaining[row]
+            p['state'] = STATES[table.state[row]]
+            p['state_times'], p['state_names'] = self.timeline.history(row)
+            p['first_run'] = table.first_run[row]
+            p['completion'] = table.completion[row]
+            p['cpu_time'] = table.burst[row]  # 'burst' may be a sequence of CPU and I/O bursts
+            p['io_wait'] = table.io_wait[row]
+            p['tat'] = p['completion'] - p['arrival']
+            p['wt'] = p['tat'] - table.burst[row] - table.io_wait[row]
+
+    def set_state(self, row, state, time=None, core=0):
+        """Record a state transition of the process in `row`; `core` is where it runs."""
+        if time is None:
+            time = self.current_time
+        self.table.state[row] = STATE_CODES[state]
+        self.timeline.log(time, row, state, core)
+
+    def admit_arrivals(self):
+        """Move every process that has arrived by `current_time` to the ready queue."""
+        # self.arrivals is sorted, so admission stops at the first future arrival
+        arrival = self.table.arrival
+        while (self.arrival_index < len(self.arrivals)
+               and arrival[self.arrivals[self.arrival_index]] <= self.current_time):
+            row = self.arrivals[self.arrival_index]
+            self.set_state(row, 'Ready')
+            self.ready_queue.push(row)
+            self.arrival_index += 1
+
+    def start_io(self, row):
+        """Block the process in `row`, which just ended a CPU burst, on its next I/O burst."""
+        table = self.table
+        index = self.phase[row] + 1
+        self.phase[row] = index + 1
+        self.set_state(row, 'Waiting')
+        self.waiting_since[row] = self.current_time
+        device = table.phase_devices[index]
+        for end, started in self.devices[device].request(row, table.phases[index], self.current_time):
+            heapq.heappush(self.io_events, (end, device, started))
+
+    def finish_io(self):
+        """Move every process whose I/O burst has ended by `current_time` to the ready queue."""
+        table = self.table
+        io_events = self.io_events
+        while io_events and io_events[0][0] <= self.current_time:
+            end, device, row = heapq.heappop(io_events)
+            for next_end, started in self.devices[device].finish(row, end):
+                heapq.heappush(io_events, (next_end, device, started))
+            table.io_wait[row] += end - self.waiting_since[row]
+            table.remaining[row] = table.phases[self.phase[row]]
+            if self.boost is not None and self.waiting_since[row] <= self.next_boost - self.boost:
+                # MLFQ: a boost happened while the process was blocked
+                self.level[row] = 0
+                self.used[row] = 0
+            self.set_state(row, 'Ready')
+            self.ready_queue.push(row)
+
+    def check_preemption(self):
+        """SRTF: preempt the running process if a ready one has less time left."""
+        if self.running_process is not None and self.ready_queue:
+            remaining = self.table.remaining
+            min_ready = self.ready_queue.peek()
+            if remaining[min_ready] < remaining[self.running_process]:
+                self.ready_queue.pop()
+                self.set_state(self.running_process, 'Ready')
+                self.ready_queue.push(self.running_process)
+                self.running_process = min_ready
+                self.set_state(self.running_process, 'Running')
+                self.time_slice = 0  # Reset time slice for new process
+
+    def check_quantum(self):
+        """RR: move the running process back to the ready queue once its quantum is used."""
+        if self.running_process is not None and self.time_slice >= self.quantum:
+            if self.table.remaining[self.running_process] > 0:  # Only if not finished
+                self.set_state(self.running_process, 'Ready')
+                self.ready_queue.push(self.running_process)
+                self.running_process = None
+                self.time_slice = 0  # Reset time slice
+
+    def check_levels(self):
+        """MLFQ: boost when due, then demote or preempt the running process.
+
+        A process that has used its level's quantum, over one run or
+        several, moves down a level; one that is running while a higher
+        level has processes waiting goes back to the ready queue at its
+        own level and keeps the time it has used there.
+        """
+        if self.boost is not None and self.current_time >= self.next_boost:
+            self.boost_levels()
+        row = self.running_process
+        if row is None:
+            return
+        level = self.level[row]
+        if self.used[row] >= self.quanta[level]:
+            if level + 1 < len(self.quanta):
+                self.level[row] = level + 1
+                self.demotions += 1
+            self.used[row] = 0
+        elif not self.ready_queue or self.ready_queue.top_level() >= level:
+            return
+        self.set_state(row, 'Ready')
+        self.ready_queue.push(row)
+        self.running_process = None
+        self.time_slice = 0
+
+    def boost_levels(self):
+        """MLFQ: move every process back to the top level with a fresh quantum."""
+        # Costs one pass over the ready queue, once per boost period
+        for row in self.ready_queue:
+            self.level[row] = 0
+            self.used[row] = 0
+        if self.running_process is not None:
+            self.level[self.running_process] = 0
+            self.used[self.running_process] = 0
+        self.ready_queue.boost()
+        self.boosts += 1
+        self.next_boost = (self.current_time // self.boost + 1) * self.boost
+
+    def io_metrics(self):
+        """Return the utilisation of each I/O device over the run, if there was I/O."""
+        if not self.io or not self.current_time:
+            return {}
+        return {'io_util': [device.utilisation(self.current_time) for device in self.devices]}
+
+    def policy_metrics(self):
+        """Return counters specific to the run's algorithm, such as MLFQ demotions.
+
+        Priority with aging counts 'overtakes', the dispatches that went to a
+        process while one of higher priority was still waiting.
+        """
+        if self.algorithm == "MLFQ":
+            return {'demotions': self.demotions, 'boosts': self.boosts}
+        if isinstance(self.ready_queue, AgingQueue):
+            return {'overtakes': self.ready_queue.overtakes}
+        return {}
+
+    def next_arrival_time(self):
+        """Return the arrival time of the next process not yet admitted, or None."""
+        if self.arrival_index < len(self.arrivals):
+            return self.table.arrival[self.arrivals[self.arrival_index]]
+        return None
+
+    def select_next_process(self):
+        """Select the next process based on the algorithm."""
+        if not self.ready_queue:
+            return
+
+        # The ready queue built for the algorithm already orders its contents
+        self.running_process = self.ready_queue.pop()
+        self.set_state(self.running_process, 'Running')
+
+
+def calculate_metrics(processes, gantt_data=None, cores=1):
+    """Return average TAT/WT, CPU utilisation and throughput for finished processes.
+
+    When the run's Gantt segments are given, CPU busy time is taken from
+    them and 'core_util' lists the utilisation of each core; otherwise
+    busy time is the sum of the CPU times, without I/O, and 'core_util'
+    is None.
+    'cpu_util' is the average over all `cores`.
+    """
+    total_time = max(p['completion'] for p in processes)
+    core_util = None
+    if gantt_data is not None:
+        core_busy = [0] * cores
+        for entry in gantt_data:
+            core_busy[entry.get('core', 0)] += entry['end'] - entry['start']
+        busy_time = sum(core_busy)
+        core_util = [busy / total_time * 100 for busy in core_busy]
+    else:
+        busy_time = sum(p.get('cpu_time', p['burst']) for p in processes)
+    return {
+        'avg_tat': sum(p['tat'] for p in processes) / len(processes),
+        'avg_wt': sum(p['wt'] for p in processes) / len(processes),
+        'cpu_util': busy_time / (total_time * cores) * 100,
+        'throughput': len(processes) / total_time,
+        'core_util': core_util,
+    }
+
+
+def simulate(processes, algorithm="FCFS", quantum=None, cores=1, **options):
+    """Schedule `processes` on `cores` CPUs and return their timeline and metrics.
+
+    Options such as MLFQ's `quanta` and `boost` or Priority's `aging` are
+    passed to Scheduler.
+    """
+    engine = Scheduler(processes, algorithm, quantum, cores=cores, **options).run()
+    metrics = calculate_metrics(engine.all_processes, engine.gantt_data, cores)
+    metrics.update(engine.policy_metrics())
+    metrics.update(engine.io_metrics())
+    return {
+        'processes': engine.all_processes,
+        'gantt_data': engine.gantt_data,
+        'execution_order': engine.execution_order,
+        'timeline': engine.timeline,
+        'metrics': metrics,
+    }
@@ -0,0 +1,447 @@
+"""Open-ended simulation of a continuous arrival stream in bounded memory.
+
+StreamingScheduler reads processes one at a time from any iterator, such
+as an endless workload.generate or a live feed, and schedules them with
+the same algorithms as Scheduler. A process that terminates is folded
+into rolling aggregates and its process-table row is reused by the next
+arrival. The timeline only keeps the last `window` time units for the
+views. Memory therefore depends on how many processes are in the system
+at once and on the window, not on how long the stream runs.
+
+    from streaming import StreamingScheduler
+    from workload import generate
+    engine = StreamingScheduler(generate(None, rate=0.18), "SRTF", window=100)
+    engine.run(should_stop=lambda: engine.current_time > 1e6)
+    print(engine.metrics())
+
+A live feed works the same way through `iter(feed.get, None)`, where
+`feed` is a queue.Queue of (pid, arrival, burst, priority) tuples ending
+with None. The run waits on the feed whenever it needs the next arrival
+time.
+"""
+import math
+from collections import deque
+from numbers import Real
+
+from process_table import ProcessTable, STATES, STATE_CODES, NOT_SET
+from scheduler import Scheduler, SimulationCancelled
+
+WINDOW = 100  # Time units of timeline kept for the views, and of rolling metrics
+BUCKETS = 50  # Time buckets a rolling window is split into
+SKETCH_ACCURACY = 0.01  # Relative error of streamed percentiles
+SKETCH_BINS = 2048  # Most bins a sketch keeps before merging its lowest ones
+QUANTILES = [50, 90, 99]
+METRICS = ['tat', 'wt', 'response']  # Per-process values aggregated as processes finish
+
+RUNNING = STATE_CODES['Running']
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch of non-negative values, after DDSketch.
+
+    Each value is counted in a logarithmic bin, so a quantile comes back
+    within `accuracy` of the true value, relative to it, and memory
+    depends on the range of the values rather than how many there are.
+    Beyond `max_bins` bins the lowest ones are merged, which only costs
+    accuracy at the bottom of the range.
+    """
+
+    def __init__(self, accuracy=SKETCH_ACCURACY, max_bins=SKETCH_BINS):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.bins = {}  # Bin key -> count of values in (gamma^(key-1), gamma^key]
+        self.zeros = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= 0:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        bins = self.bins
+        bins[key] = bins.get(key, 0) + 1
+        if len(bins) > self.max_bins:
+            self.collapse()
+
+    def merge(self, other):
+        """Add the values counted by `other`, a sketch with the same accuracy."""
+        bins = self.bins
+        for key, count in other.bins.items():
+            bins[key] = bins.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(bins) > self.max_bins:
+            self.collapse()
+
+    def collapse(self):
+        # Fold the lowest bins into the lowest one kept
+        keys = sorted(self.bins)
+        excess = keys[:len(keys) - self.max_bins + 1]
+        self.bins[excess[-1]] += sum(self.bins.pop(key) for key in excess[:-1])
+
+    def quantile(self, q):
+        """Return the `q` quantile (0 to 1) of the values, or None if there are none."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return self.min
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class Aggregate:
+    """Count, sums and sketches of the processes that finished over some span, and CPU busy time."""
+
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.count = 0
+        self.busy = 0.0
+        self.sums = dict.fromkeys(METRICS, 0.0)
+        self.sketches = {name: QuantileSketch(accuracy) for name in METRICS}
+
+    def add(self, values):
+        """Count one finished process with its METRICS `values`."""
+        self.count += 1
+        for name, value in values.items():
+            self.sums[name] += value
+            self.sketches[name].add(value)
+
+    def merge(self, other):
+        self.count += other.count
+        self.busy += other.busy
+        for name in METRICS:
+            self.sums[name] += other.sums[name]
+            self.sketches[name].merge(other.sketches[name])
+
+
+class RollingWindow:
+    """Aggregates over the last `span` time units, kept in `buckets` time buckets.
+
+    Values are added to the bucket of the time they happen in, and buckets
+    older than the span are dropped, so the window moves in steps of one
+    bucket and memory stays fixed. Busy time is kept apart from the
+    buckets of finished processes, which stay None until one is added.
+    """
+
+    def __init__(self, span=WINDOW, buckets=BUCKETS, accuracy=SKETCH_ACCURACY):
+        if span <= 0 or buckets < 1:
+            raise ValueError("Metrics window and buckets must be greater than zero")
+        self.span = span
+        self.width = span / buckets
+        self.size = buckets
+        self.accuracy = accuracy
+        self.buckets = deque()
+        self.busy = deque()  # CPU busy time per bucket
+        self.first = 0  # Index of buckets[0]; bucket i covers [i * width, (i + 1) * width)
+
+    def advance(self, time):
+        """Move the window to end at `time`."""
+        index = int(time // self.width)
+        buckets = self.buckets
+        last = self.first + len(buckets) - 1
+        if index == last:
+            return
+        if index - last >= self.size:
+            buckets.clear()  # Nothing happened for a whole window
+            self.busy.clear()
+            self.first = index - self.size + 1
+            last = self.first - 1
+        buckets.extend([None] * (index - last))
+        self.busy.extend([0.0] * (index - last))
+        while len(buckets) > self.size:
+            buckets.popleft()
+            self.busy.popleft()
+            self.first += 1
+
+    def bucket(self, index):
+        # Return the aggregate of bucket `index`, creating it if need be
+        aggregate = self.buckets[index - self.first]
+        if aggregate is None:
+            aggregate = self.buckets[index - self.first] = Aggregate(self.accuracy)
+        return aggregate
+
+    def add(self, time, values):
+        """Count a process that finished at `time`, the latest time seen."""
+        self.advance(time)
+        self.bucket(self.first + len(self.buckets) - 1).add(values)
+
+    def add_busy(self, start, end):
+        """Add CPU busy time from `start` to `end`, the latest time seen."""
+        self.advance(end)
+        width = self.width
+        for index in range(max(int(start // width), self.first), self.first + len(self.buckets)):
+            low = max(start, index * width)
+            high = min(end, (index + 1) * width)
+            if high > low:
+                self.busy[index - self.first] += high - low
+
+    def total(self, time):
+        """Return (aggregate, start) over the window ending at `time`."""
+        self.advance(time)
+        aggregate = Aggregate(self.accuracy)
+        for bucket in self.buckets:
+            if bucket is not None:
+                aggregate.merge(bucket)
+        aggregate.busy = sum(self.busy)
+        return aggregate, self.first * self.width
+
+
+class SlotTable(ProcessTable):
+    """ProcessTable whose rows are reused once their process has been released."""
+
+    def __init__(self):
+        super().__init__()
+        self.free = []  # Rows of released processes, ready for reuse
+
+    def add(self, pid, arrival, burst, priority=0, devices=None):
+        """Put a process in a free row, or append one; return the row."""
+        if not isinstance(burst, Real):
+            raise ValueError("Streamed processes have a single CPU burst")
+        if not self.free:
+            return super().add(pid, arrival, burst, priority)
+        if arrival < 0:
+            raise ValueError("Arrival time cannot be negative")
+        if burst <= 0:
+            raise ValueError("Burst time must be greater than zero")
+        if pid in self.index:
+            raise ValueError(f"Process with PID {pid} already exists")
+        row = self.free.pop()
+        self.pids[row] = pid
+        self.index[pid] = row
+        self.arrival[row] = arrival
+        self.burst[row] = burst
+        self.priority[row] = priority
+        self.remaining[row] = burst
+        self.completion[row] = NOT_SET
+        self.first_run[row] = NOT_SET
+        self.io_wait[row] = 0.0
+        self.state[row] = STATE_CODES['New']
+        return row
+
+    def release(self, row):
+        """Forget the process in `row` and free the row for the next one."""
+        del self.index[self.pids[row]]
+        self.free.append(row)
+
+
+class WindowTimeline:
+    """Timeline that keeps only the last `span` time units of a streaming run.
+
+    It takes the same log and mark_frame calls from the scheduler as
+    Timeline, but stores pids rather than rows, which are reused, and
+    drops what scrolls out of the window. `on_segment(start, end)` is
+    called as each Gantt segment closes.
+    """
+
+    def __init__(self, pids, cores=1, span=WINDOW, on_segment=None):
+        self.pids = pids  # Row -> pid, shared with the process table
+        self.cores = cores
+        self.span = span
+        self.on_segment = on_segment
+        self.time = 0
+        self.events = deque()  # (time, pid, state code) transitions
+        self.segments = deque()  # [pid, start, end, core] Gantt segments; end is None while running
+        self._open_segments = {}  # Row -> its segment still running
+
+    def log(self, time, row, state, core=0):
+        code = STATE_CODES[state]
+        pid = self.pids[row]
+        self.events.append((time, pid, code))
+        if code == RUNNING:
+            segment = [pid, time, None, core]
+            self._open_segments[row] = segment
+            self.segments.append(segment)
+        elif self._open_segments:
+            segment = self._open_segments.pop(row, None)
+            if segment is not None:
+                segment[2] = time
+                if self.on_segment is not None:
+                    self.on_segment(segment[1], time)
+
+    def mark_frame(self, time):
+        # Drop what has scrolled out of the window
+        self.time = time
+        start = time - self.span
+        events = self.events
+        while events and events[0][0] < start:
+            events.popleft()
+        segments = self.segments
+        while segments and segments[0][2] is not None and segments[0][2] < start:
+            segments.popleft()
+
+    def running_since(self):
+        """Return the start times of the segments still running."""
+        return [segment[1] for segment in self._open_segments.values()]
+
+    def history(self, row):
+        """Return (state_times, state_names) of the process in `row` within the window."""
+        pid = self.pids[row]
+        times, names = [], []
+        for time, event_pid, code in self.events:
+            if event_pid == pid:
+                times.append(time)
+                names.append(STATES[code])
+        return times, names
+
+    def snapshot(self):
+        """Return the window as plain data the renderers can draw.
+
+        The dict holds 'time', 'start' (the left edge of the window),
+        'segments' as {'pid', 'start', 'end', 'core'} dicts with 'end' None
+        while running, and 'processes' as {'pid', 'state_times',
+        'state_names'} dicts of the transitions in the window, in order of
+        each process's first one.
+        """
+        processes = {}
+        for time, pid, code in list(self.events):
+            p = processes.get(pid)
+            if p is None:
+                p = processes[pid] = {'pid': pid, 'state_times': [], 'state_names': []}
+            p['state_times'].append(time)
+            p['state_names'].append(STATES[code])
+        segments = [{'pid': pid, 'start': start, 'end': end, 'core': core}
+                    for pid, start, end, core in list(self.segments)]
+        return {'time': self.time, 'start': self.time - self.span,
+                'segments': segments, 'processes': list(processes.values())}
+
+
+class StreamingScheduler(Scheduler):
+    """Scheduler fed by an iterator of (pid, arrival, burst[, priority]) in arrival order.
+
+    `window` is the time span of timeline kept for the views and
+    `metrics_window` that of the rolling metrics, the same by default.
+    Other arguments are as for Scheduler; processes have a single CPU
+    burst. run() goes on until the source is exhausted and every process
+    has finished, or until `should_stop()` cancels it; the metrics stay
+    readable either way.
+    """
+
+    def __init__(self, source, algorithm="FCFS", quantum=None, cores=1, window=WINDOW,
+                 metrics_window=None, buckets=BUCKETS, accuracy=SKETCH_ACCURACY, **options):
+        if window <= 0:
+            raise ValueError("Window must be greater than zero")
+        super().__init__(SlotTable(), algorithm, quantum, cores=cores, **options)
+        self.source = iter(source)
+        self.rolling = RollingWindow(window if metrics_window is None else metrics_window,
+                                     buckets, accuracy)
+        self.total = Aggregate(accuracy)  # Over the whole run
+        self.timeline = WindowTimeline(self.table.pids, cores, window, self.add_busy)
+        self.table.timeline = self.timeline
+        self.gantt_data = None  # The window's segments are in timeline.snapshot()
+        self.admitted = 0
+        self.last_arrival = 0
+        # self.arrivals holds the row of the next process read from the
+        # source, and is empty once the source is exhausted
+        self.fetch()
+
+    def fetch(self):
+        # Read the next process from the source into a free row
+        try:
+            pid, arrival, burst, *priority = next(self.source)
+        except StopIteration:
+            self.arrivals = []
+            return
+        if arrival < self.last_arrival:
+            raise ValueError(f"Process {pid} arrives at {arrival}, before the one streamed ahead of it")
+        self.last_arrival = arrival
+        row = self.table.add(pid, arrival, burst, priority[0] if priority else 0)
+        if row == len(self.level):
+            self.level.append(0)
+            self.used.append(0.0)
+        else:
+            self.level[row] = 0
+            self.used[row] = 0
+        self.arrivals = [row]
+
+    def admit_arrivals(self):
+        """Move every streamed process that has arrived by `current_time` to the ready queue."""
+        arrival = self.table.arrival
+        while self.arrivals and arrival[self.arrivals[0]] <= self.current_time:
+            row = self.arrivals[0]
+            self.set_state(row, 'Ready')
+            self.ready_queue.push(row)
+            self.admitted += 1
+            self.fetch()
+
+    def set_state(self, row, state, time=None, core=0):
+        super().set_state(row, state, time, core)
+        if state == 'Terminated':
+            self.retire(row)
+
+    def retire(self, row):
+        # Fold a terminated process into the aggregates and free its row
+        table = self.table
+        completion = table.completion[row]
+        tat = completion - table.arrival[row]
+        values = {'tat': tat, 'wt': tat - table.burst[row],
+                  'response': table.first_run[row] - table.arrival[row]}
+        self.rolling.add(completion, values)
+        self.total.add(values)
+        table.release(row)
+
+    def add_busy(self, start, end):
+        self.rolling.add_busy(start, end)
+        self.total.busy += end - start
+
+    def report(self, progress, should_stop):
+        # The total is unknown, so progress gets None for it
+        if should_stop is not None and should_stop():
+            raise SimulationCancelled()
+        if progress is not None:
+            progress(self.finished, None)
+
+    def finish(self, progress=None):
+        """Close the run once the source is exhausted and every process has finished."""
+        self.timeline.mark_frame(self.current_time)
+        if progress is not None:
+            progress(self.finished, None)
+        return self
+
+    def metrics(self, windowed=True):
+        """Return metrics over the rolling window, or over the whole run.
+
+        Holds 'time', 'finished' (processes finished in the span),
+        'in_system' (arrived and not finished), 'cpu_util', 'throughput',
+        'avg_tat', 'avg_wt' and 'avg_response', and 'tat_p50',
+        'response_p99' and so on for each of QUANTILES. Averages and
+        percentiles are None until a process has finished in the span.
+        Call it from the thread running the scheduler, such as from its
+        progress callback.
+        """
+        now = self.current_time
+        if windowed:
+            aggregate, start = self.rolling.total(now)
+            start = max(start, 0)
+        else:
+            aggregate, start = self.total, 0
+        span = now - start
+        busy = aggregate.busy + sum(now - max(since, start) for since in self.timeline.running_since())
+        count = aggregate.count
+        result = {
+            'time': now,
+            'finished': count,
+            'in_system': self.admitted - self.finished,
+            'cpu_util': busy / (span * self.cores) * 100 if span > 0 else 0.0,
+            'throughput': count / span if span > 0 else 0.0,
+        }
+        for name in METRICS:
+            result[f'avg_{name}'] = aggregate.sums[name] / count if count else None
+            for q in QUANTILES:
+                result[f'{name}_p{q}'] = aggregate.sketches[name].quantile(q / 100)
+        return result
@@ -0,0 +1,129 @@
+"""Parallel parameter sweeps over the headless scheduler.
+
+Runs every combination of algorithm, RR quantum, workload seed, workload
+size and core count on a process pool and streams one CSV row of metrics
+per run to a results file as runs finish. Tasks carry only (algorithm,
+quantum, seed, size, cores); each worker builds the workload itself and caches
+it, so no process data is pickled between processes.
+
+Run from the repository root:
+
+    python sweep.py --algorithms FCFS RR SRTF --quantums 1 2 4 --seeds 0 1 2 --sizes 100 1000 -o results.csv
+    python sweep.py --algorithms SRTF --sizes 10000 --cores 1 2 4 8 -o scaling.csv
+"""
+import argparse
+import csv
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+import analytics
+import scheduler
+from process_table import ProcessTable
+
+FIELDS = (['algorithm', 'quantum', 'seed', 'size', 'cores',
+           'avg_tat', 'avg_wt', 'cpu_util', 'throughput']
+          + analytics.FIELDS + ['seconds'])
+
+
+@lru_cache(maxsize=8)
+def make_workload(seed, size):
+    """Return a random ProcessTable of `size` processes, the same for the same seed."""
+    rng = random.Random(seed)
+    table = ProcessTable()
+    for i in range(size):
+        # Arrivals spread so that load stays comparable across sizes
+        table.add(f"P{i}", rng.randint(0, size * 3), rng.randint(1, 10), rng.randint(1, 5))
+    return table
+
+
+def grid(algorithms, quantums, seeds, sizes, cores=(1,)):
+    """Return the (algorithm, quantum, seed, size, cores) runs of a sweep.
+
+    The quantum only applies to RR and MLFQ (as its top level's quantum);
+    other algorithms run once per workload with quantum None. MLFQ runs
+    on a single core, so it is left out of the multi-core points.
+    """
+    runs = []
+    for size in sizes:
+        for seed in seeds:
+            for algorithm in algorithms:
+                if algorithm not in scheduler.ALGORITHMS:
+                    raise ValueError(f"Unknown algorithm: {algorithm}")
+                for quantum in (quantums if algorithm in ("RR", "MLFQ") else [None]):
+                    for count in cores:
+                        if algorithm == "MLFQ" and count > 1:
+                            continue
+                        runs.append((algorithm, quantum, seed, size, count))
+    return runs
+
+
+def run_one(algorithm, quantum, seed, size, cores=1):
+    """Simulate one grid point and return its results row."""
+    table = make_workload(seed, size)
+    start = time.perf_counter()
+    result = scheduler.simulate(table, algorithm, quantum, cores)
+    seconds = time.perf_counter() - start
+    metrics = result['metrics']
+    metrics.update(analytics.analyze(table, result['timeline']))
+    return {
+        'algorithm': algorithm, 'quantum': quantum, 'seed': seed, 'size': size, 'cores': cores,
+        **metrics,
+        'seconds': seconds,
+    }
+
+
+def run_grid(runs, workers=None):
+    """Run `runs` on a process pool and yield each results row as it finishes."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Runs sharing a workload are submitted together, so a worker that
+        # picks up several of them reuses its cached table
+        futures = [executor.submit(run_one, *run) for run in runs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def sweep(algorithms, quantums, seeds, sizes, output, workers=None, cores=(1,)):
+    """Run the grid and write one CSV row per run to `output`; return the row count."""
+    runs = grid(algorithms, quantums, seeds, sizes, cores)
+    with open(output, 'w', newline='') as f:
+        # Per-core utilisation varies in length, so it is left out of the CSV
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for row in run_grid(runs, workers):
+            writer.writerow(row)
+            f.flush()  # Keep the file usable while the sweep is still running
+    return len(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--algorithms", nargs="+", default=scheduler.ALGORITHMS,
+                        choices=scheduler.ALGORITHMS)
+    parser.add_argument("--quantums", nargs="+", type=float, default=[2], help="RR and top-level MLFQ time quanta")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100], help="processes per workload")
+    parser.add_argument("--cores", nargs="+", type=int, default=[1], help="CPU core counts")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("-o", "--output", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    for quantum in args.quantums:
+        if quantum <= 0:
+            parser.error("Quantum must be greater than zero")
+    for size in args.sizes:
+        if size < 1:
+            parser.error("Workload size must be at least 1")
+    for count in args.cores:
+        if count < 1:
+            parser.error("Core count must be at least 1")
+
+    start = time.perf_counter()
+    count = sweep(args.algorithms, args.quantums, args.seeds, args.sizes, args.output, args.workers,
+                  args.cores)
+    print(f"{count} runs written to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
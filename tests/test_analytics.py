@@ -0,0 +1,17 @@
+from analytics import analyze
+from scheduler import Scheduler, make_process
+
+
+def test_lone_process_quantum_expiries_are_not_preemptions():
+    engine = Scheduler([make_process("A", 0, 6, 1)], "RR", 2).run()
+    summary = analyze(engine.table)
+    assert (summary['context_switches'], summary['preemptions']) == (0, 0)
+
+
+def test_round_robin_preemptions_count_switches_away():
+    # A's first expiry at 2 re-dispatches it at once; B has arrived by its
+    # second at 4, and B's own expiry at 6 hands the CPU back to A
+    engine = Scheduler([make_process("A", 0, 6, 1), make_process("B", 3, 4, 1)], "RR", 2).run()
+    summary = analyze(engine.table)
+    assert summary['preemptions'] == 2
+    assert summary['context_switches'] == 3
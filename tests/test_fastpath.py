@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+import fastpath
+from process_table import ProcessTable
+from scheduler import Scheduler
+
+
+def run_scheduler(arrival, burst, algorithm):
+    table = ProcessTable()
+    for i, (a, b) in enumerate(zip(arrival.tolist(), burst.tolist())):
+        table.add(f"P{i}", a, b)
+    Scheduler(table, algorithm).run()
+    return np.array(table.first_run), np.array(table.completion)
+
+
+@pytest.mark.parametrize("algorithm", fastpath.FAST_ALGORITHMS)
+@pytest.mark.parametrize("seed", range(5))
+def test_integer_workloads_match_exactly(algorithm, seed):
+    rng = np.random.default_rng(seed)
+    arrival = rng.integers(0, 300, 200)  # Many ties in arrival and burst
+    burst = rng.integers(1, 6, 200)
+    first_run, completion = run_scheduler(arrival, burst, algorithm)
+    result = fastpath.schedule(arrival, burst, algorithm)
+    assert np.array_equal(result['first_run'], first_run)
+    assert np.array_equal(result['completion'], completion)
+
+
+@pytest.mark.parametrize("algorithm", fastpath.FAST_ALGORITHMS)
+@pytest.mark.parametrize("seed", range(5))
+def test_fractional_workloads_match_to_rounding(algorithm, seed):
+    rng = np.random.default_rng(seed)
+    arrival = rng.uniform(0, 1000, 500)
+    burst = rng.exponential(2.0, 500) + 0.01
+    first_run, completion = run_scheduler(arrival, burst, algorithm)
+    result = fastpath.schedule(arrival, burst, algorithm)
+    assert np.allclose(result['first_run'], first_run)
+    assert np.allclose(result['completion'], completion)
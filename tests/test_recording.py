@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import workload
+from recording import TABLE_COLUMNS, TIMELINE_COLUMNS, load_run, save_run
+from scheduler import Scheduler
+
+
+def save_and_load(tmp_path, engine, algorithm, quantum):
+    path = str(tmp_path / "run.npz")
+    save_run(path, engine.table, engine.timeline, algorithm, quantum,
+             options={'quanta': engine.quanta, 'boost': engine.boost, 'aging': engine.aging},
+             policy_metrics=engine.policy_metrics(), io_metrics=engine.io_metrics())
+    return load_run(path)
+
+
+def test_round_trip_keeps_run_settings_and_counters(tmp_path):
+    table = workload.make_table(300, 1, io_bursts=2, devices=2)
+    engine = Scheduler(table, "MLFQ", 1, quanta=[1, 2, 4], boost=40).run()
+    loaded, timeline, info = save_and_load(tmp_path, engine, "MLFQ", 1)
+
+    for name in TABLE_COLUMNS:
+        assert np.array_equal(getattr(loaded, name), getattr(engine.table, name), equal_nan=True)
+    for name in TIMELINE_COLUMNS:
+        assert np.array_equal(getattr(timeline, name), getattr(engine.timeline, name), equal_nan=True)
+    assert loaded.pids == engine.table.pids
+    assert info['algorithm'] == "MLFQ"
+    assert info['quantum'] == 1
+    assert info['options'] == {'quanta': [1, 2, 4], 'boost': 40, 'aging': 0}
+    assert info['policy_metrics'] == engine.policy_metrics()
+    assert info['policy_metrics']['demotions'] > 0
+    assert info['io_metrics']['io_util'] == pytest.approx(engine.io_metrics()['io_util'])
+
+
+def test_round_trip_of_priority_with_aging(tmp_path):
+    table = workload.make_table(200, 2)
+    engine = Scheduler(table, "Priority", aging=0.5, cores=2).run()
+    _, timeline, info = save_and_load(tmp_path, engine, "Priority", None)
+    assert timeline.cores == 2
+    assert info['quantum'] is None
+    assert info['options'] == {'quanta': None, 'boost': None, 'aging': 0.5}
+    assert info['policy_metrics'] == {'overtakes': engine.policy_metrics()['overtakes']}
+    assert info['io_metrics'] == {}
+
+
+def test_loaded_histories_match_the_run(tmp_path):
+    table = workload.make_table(200, 3, io_bursts=1)
+    engine = Scheduler(table, "RR", 2, cores=2).run()
+    histories = [engine.timeline.history(row) for row in range(len(table))]
+    _, timeline, _ = save_and_load(tmp_path, engine, "RR", 2)
+    assert [timeline.history(row) for row in range(len(table))] == histories
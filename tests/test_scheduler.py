@@ -0,0 +1,66 @@
+import pytest
+
+from scheduler import Scheduler, calculate_metrics, make_process, simulate
+
+# (pid, arrival, burst, priority) with simultaneous arrivals and equal bursts
+WORKLOAD = [("P1", 0, 7, 2), ("P2", 2, 4, 1), ("P3", 4, 1, 3), ("P4", 5, 4, 3), ("P5", 5, 2, 5), ("P6", 12, 3, 1)]
+
+# (completion, TAT, WT) of each process under the original unit-tick loop
+BASELINE = {
+    ("FCFS", None): [(7, 7, 0), (11, 9, 5), (12, 8, 7), (16, 11, 7), (18, 13, 11), (21, 9, 6)],
+    ("SJF", None): [(7, 7, 0), (14, 12, 8), (8, 4, 3), (21, 16, 12), (10, 5, 3), (17, 5, 2)],
+    ("RR", 2): [(20, 20, 13), (9, 7, 3), (7, 3, 2), (17, 12, 8), (13, 8, 6), (21, 9, 6)],
+    ("Priority", None): [(7, 7, 0), (18, 16, 12), (10, 6, 5), (14, 9, 5), (9, 4, 2), (21, 9, 6)],
+    ("SRTF", None): [(21, 21, 14), (7, 5, 1), (5, 1, 0), (13, 8, 4), (9, 4, 2), (16, 4, 1)],
+}
+
+
+@pytest.mark.parametrize("algorithm, quantum", BASELINE)
+def test_matches_unit_tick_baseline(algorithm, quantum):
+    result = simulate([make_process(*p) for p in WORKLOAD], algorithm, quantum)
+    assert [(p['completion'], p['tat'], p['wt']) for p in result['processes']] == BASELINE[algorithm, quantum]
+
+
+def io_records():
+    return [{'pid': 'A', 'arrival': 0, 'burst': [2, 3, 1]}, {'pid': 'B', 'arrival': 1, 'burst': 4}]
+
+
+def test_metrics_without_gantt_data_split_cpu_and_io():
+    processes = Scheduler(io_records(), "FCFS").run().all_processes
+    a, b = processes
+    assert (a['cpu_time'], a['io_wait']) == (3, 3)
+    assert (b['cpu_time'], b['io_wait']) == (4, 0)
+    metrics = calculate_metrics(processes)
+    total_time = max(p['completion'] for p in processes)
+    assert metrics['cpu_util'] == pytest.approx(7 / total_time * 100)
+    assert metrics['avg_wt'] == pytest.approx(simulate(io_records(), "FCFS")['metrics']['avg_wt'])
+
+
+def starved_workload():
+    # A low-priority process behind a steady stream of high-priority ones
+    return [make_process("L", 0, 2, 1)] + [make_process(f"H{i}", 2 * i, 2, 5) for i in range(12)]
+
+
+def test_aging_relieves_starvation():
+    plain = simulate(starved_workload(), "Priority")
+    aged = simulate(starved_workload(), "Priority", aging=1)
+    assert plain['processes'][0]['completion'] == 26
+    assert aged['processes'][0]['completion'] == 6
+    assert 'overtakes' not in plain['metrics']
+    assert aged['metrics']['overtakes'] == 1
+
+
+def test_mlfq_demotes_and_boosts():
+    def workload():
+        return [make_process("A", 0, 30), make_process("B", 11, 1)]
+
+    settled = simulate(workload(), "MLFQ", quanta=[2, 4, 8])
+    # A sinks to the bottom level, where B arriving at the top preempts it
+    assert settled['metrics']['demotions'] == 2
+    assert settled['processes'][1]['completion'] == 12
+
+    boosted = simulate(workload(), "MLFQ", quanta=[2, 4, 8], boost=10)
+    # Each boost lifts A back to the top level, so it is demoted all over again
+    assert boosted['metrics']['boosts'] == 3
+    assert boosted['metrics']['demotions'] == 6
+    assert boosted['processes'][1]['completion'] == 13
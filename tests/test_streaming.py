@@ -0,0 +1,33 @@
+import tracemalloc
+
+import pytest
+
+from scheduler import SimulationCancelled
+from streaming import StreamingScheduler
+from workload import MEAN_BURST, generate
+
+LOAD = 0.9
+
+
+@pytest.mark.parametrize("algorithm, cores", [("FCFS", 1), ("RR", 1), ("SRTF", 1), ("RR", 2), ("SRTF", 2)])
+def test_memory_stays_flat(algorithm, cores):
+    engine = StreamingScheduler(generate(None, seed=1, rate=LOAD * cores / MEAN_BURST),
+                                algorithm, quantum=2, cores=cores)
+    samples = []
+
+    def sample(finished, total):
+        samples.append((finished, tracemalloc.get_traced_memory()[0]))
+
+    tracemalloc.start()
+    try:
+        engine.run(sample, should_stop=lambda: engine.current_time > 40000)
+    except SimulationCancelled:
+        pass
+    finally:
+        tracemalloc.stop()
+    # Compare a quarter of the way in with the end, once the windows have filled
+    early = next(memory for finished, memory in samples if finished >= engine.finished // 4)
+    assert engine.finished > 5000
+    assert samples[-1][1] - early < 1e6
+    if cores > 1:
+        assert len(engine.finishing) <= 2 * cores
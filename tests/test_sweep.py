@@ -0,0 +1,12 @@
+import scheduler
+import sweep
+
+
+def test_default_grid_on_several_cores():
+    runs = sweep.grid(scheduler.ALGORITHMS, [2], [0], [20], cores=(1, 2))
+    assert ("MLFQ", 2, 0, 20, 1) in runs
+    assert ("MLFQ", 2, 0, 20, 2) not in runs
+    assert ("SRTF", None, 0, 20, 2) in runs
+    for run in runs:
+        row = sweep.run_one(*run)
+        assert row['cores'] == run[4]
@@ -0,0 +1,10 @@
+import pytest
+
+import traces
+
+
+def test_malformed_csv_is_a_value_error(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text('pid,arrival,burst\nA,0,1\n"' + 'x' * 200000 + '",1,2\n')
+    with pytest.raises(ValueError, match="Line 3"):
+        traces.load_trace(str(path))
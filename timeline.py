@@ -0,0 +1,201 @@
+"""Append-only record of a simulation, used to replay it frame by frame.
+
+Instead of copying the whole Gantt history and ready queue at every step,
+the scheduler appends each state transition and Gantt segment once and
+marks frames as offsets into those logs. Any frame can be rebuilt from a
+prefix of the logs, so memory grows linearly with the number of events.
+The logs are typed arrays of process-table rows, times and state codes.
+"""
+from array import array
+
+from process_table import STATES, STATE_CODES
+
+READY = STATE_CODES['Ready']
+RUNNING = STATE_CODES['Running']
+WAITING = STATE_CODES['Waiting']
+
+
+class GanttSegments:
+    """Read-only list-like view of a timeline's segments as {'pid', 'start', 'end'} dicts."""
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+
+    def __len__(self):
+        return len(self.timeline.segment_ends)  # Appended last in Timeline.log
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        tl = self.timeline
+        end = tl.segment_ends[index]
+        return {
+            'pid': tl.pids[tl.segment_rows[index]],
+            'start': tl.segment_starts[index],
+            'end': end if end == end else None,  # NaN while the segment is still open
+            'core': tl.segment_cores[index]
+        }
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class Timeline:
+    """State-transition log, Gantt segments and frame offsets for one run on `cores` CPUs."""
+
+    def __init__(self, pids, cores=1):
+        self.pids = pids  # Row -> pid, shared with the process table
+        self.cores = cores
+
+        # State transitions, in order, each linked to the previous one of its
+        # row so a row's history is read without scanning the whole log
+        self.event_times = array('d')
+        self.event_rows = array('q')
+        self.event_previous = array('q')  # -1 for a row's first transition
+        self.event_states = bytearray()
+        self.row_events = array('q', [-1]) * len(pids)  # Last transition of each row
+
+        # Gantt segments, in order
+        self.segment_rows = array('q')
+        self.segment_cores = array('q')
+        self.segment_starts = array('d')
+        self.segment_ends = array('d')
+        self.gantt_data = GanttSegments(self)
+        self._open_segments = {}  # Row -> index of its segment still running
+
+        # Per frame: time and the lengths of both logs at that point
+        self.frame_times = array('d')
+        self.frame_events = array('q')
+        self.frame_segments = array('q')
+
+        # Replay state for the last reconstructed frame
+        self._frame_index = None
+        self._frame = None
+        self._offset = 0
+        self._ready = {}
+        self._waiting = {}  # Rows blocked on I/O, in the order they started waiting
+        self._running = {}  # Row -> core
+        self._dispatches = 0  # Running events replayed, i.e. segments started
+
+    def log(self, time, row, state, core=0):
+        code = STATE_CODES[state]
+        last = self.row_events
+        try:
+            previous = last[row]
+        except IndexError:
+            # A row added to the table after the timeline was created
+            last.extend(array('q', [-1]) * (row + 1 - len(last)))
+            previous = -1
+        self.event_times.append(time)
+        self.event_rows.append(row)
+        self.event_previous.append(previous)
+        last[row] = len(self.event_previous) - 1
+        self.event_states.append(code)
+
+        # A Gantt segment opens when a process is dispatched to a core and
+        # closes when it leaves it, so each one covers a single uninterrupted run
+        if code == RUNNING:
+            self._open_segments[row] = len(self.segment_rows)
+            self.segment_rows.append(row)
+            self.segment_cores.append(core)
+            self.segment_starts.append(time)
+            self.segment_ends.append(float('nan'))
+        elif self._open_segments:
+            segment = self._open_segments.pop(row, None)
+            if segment is not None:
+                self.segment_ends[segment] = time
+
+    def execution_order(self):
+        """Return the pids in the order they got the CPU, one per segment run."""
+        order = []
+        last = None
+        for row in self.segment_rows:
+            # A process re-dispatched straight after its quantum expired
+            # continues the same run
+            if row != last:
+                order.append(self.pids[row])
+                last = row
+        return order
+
+    def history(self, row):
+        """Return (state_times, state_names) lists for the process in `row`."""
+        # Follow the row's links back from its last transition. The state
+        # code is appended last, so transitions at or past its length are
+        # still being written by the scheduler's thread and are skipped.
+        end = len(self.event_states)
+        times, names = [], []
+        previous, event_times, states = self.event_previous, self.event_times, self.event_states
+        i = self.row_events[row] if row < len(self.row_events) else -1
+        while i >= 0:
+            if i < end:
+                times.append(event_times[i])
+                names.append(STATES[states[i]])
+            i = previous[i]
+        times.append(0)
+        names.append('New')
+        times.reverse()
+        names.reverse()
+        return times, names
+
+    def mark_frame(self, time):
+        self.frame_times.append(time)
+        self.frame_events.append(len(self.event_rows))
+        self.frame_segments.append(len(self.segment_rows))
+
+    def __len__(self):
+        return len(self.frame_segments)  # Appended last in mark_frame
+
+    def frame(self, index):
+        """Return the state at frame `index` as a dict.
+
+        The dict holds 'time', 'gantt_end' (the number of segments in
+        self.gantt_data started so far; the last one may still be running
+        at 'time' and should be clipped to it), 'ready_queue' (pids in queue
+        order), 'waiting' (pids blocked on I/O), 'running' (the pid on each
+        core, None when idle) and 'running_process' (the pid on core 0). Frames requested in
+        increasing order are rebuilt incrementally from the previous one.
+        """
+        if index == self._frame_index:
+            return self._frame
+        time = self.frame_times[index]
+        offset = self.frame_events[index]
+        if offset < self._offset:
+            # Going backwards: replay from the start of the log
+            self._offset = 0
+            self._ready = {}
+            self._waiting = {}
+            self._running = {}
+            self._dispatches = 0
+
+        rows, states = self.event_rows, self.event_states
+        running = self._running
+        for i in range(self._offset, offset):
+            row = rows[i]
+            state = states[i]
+            if state == RUNNING:
+                self._ready.pop(row, None)
+                # Running events and segments are logged together, in the same order
+                running[row] = self.segment_cores[self._dispatches]
+                self._dispatches += 1
+            else:
+                running.pop(row, None)
+                if state == READY:
+                    self._waiting.pop(row, None)
+                    self._ready[row] = None
+                elif state == WAITING:
+                    self._waiting[row] = None
+        self._offset = offset
+
+        cores = [None] * self.cores
+        for row, core in running.items():
+            cores[core] = self.pids[row]
+        self._frame_index = index
+        self._frame = {
+            'time': time,
+            'gantt_end': self.frame_segments[index],
+            'ready_queue': [self.pids[row] for row in self._ready],
+            'waiting': [self.pids[row] for row in self._waiting],
+            'running': cores,
+            'running_process': cores[0]
+        }
+        return self._frame
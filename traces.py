@@ -0,0 +1,154 @@
+"""Streaming loader for recorded process traces in CSV or JSONL.
+
+A trace has one process per row with 'pid', 'arrival' and 'burst' and an
+optional 'priority': a header row plus comma-separated rows for CSV, or
+one JSON object per line for JSONL. Rows are read and validated a chunk
+at a time and appended to a ProcessTable as columns, so no per-process
+dicts are built and memory stays proportional to the table itself.
+
+    from traces import load_trace
+    from scheduler import simulate
+    result = simulate(load_trace("trace.csv", use_mmap=True), "SRTF")
+"""
+import csv
+import io
+import json
+import math
+import mmap
+import os
+
+from process_table import ProcessTable
+
+COLUMNS = ['pid', 'arrival', 'burst', 'priority']
+REQUIRED = ['pid', 'arrival', 'burst']
+CHUNK_SIZE = 1 << 16
+
+
+def read_lines(path, use_mmap=False):
+    """Yield the lines of `path` as text, optionally reading through mmap."""
+    with open(path, 'rb') as f:
+        if use_mmap:
+            if os.fstat(f.fileno()).st_size == 0:
+                return  # Empty files cannot be mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for line in iter(mapped.readline, b''):
+                    yield line.decode('utf-8')
+        else:
+            yield from io.TextIOWrapper(f, encoding='utf-8', newline='')
+
+
+def csv_rows(lines):
+    """Yield (line number, [pid, arrival, burst, priority]) from CSV lines."""
+    reader = csv.reader(lines)
+    positions = None
+    try:
+        for fields in reader:
+            if not fields:
+                continue  # Blank line
+            if positions is None:
+                header = [name.strip().lower() for name in fields]
+                for name in REQUIRED:
+                    if name not in header:
+                        raise ValueError(f"Trace is missing the '{name}' column")
+                positions = [header.index(name) if name in header else None for name in COLUMNS]
+                continue
+            if len(fields) != len(header):
+                raise ValueError(f"Line {reader.line_num}: expected {len(header)} fields, got {len(fields)}")
+            yield reader.line_num, [fields[i] if i is not None else 0 for i in positions]
+    except csv.Error as e:
+        raise ValueError(f"Line {reader.line_num}: invalid CSV ({e})")
+
+
+def jsonl_rows(lines):
+    """Yield (line number, [pid, arrival, burst, priority]) from JSONL lines."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            row = [record[name] for name in REQUIRED]
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"Line {number}: invalid trace record ({e})")
+        row.append(record.get('priority', 0))
+        yield number, row
+
+
+def to_floats(values, numbers, name):
+    """Convert a column to floats in one pass; on failure report the first bad row."""
+    try:
+        column = list(map(float, values))
+        if all(map(math.isfinite, column)):
+            return column
+    except (ValueError, TypeError):
+        pass
+    for value, number in zip(values, numbers):
+        try:
+            if math.isfinite(float(value)):
+                continue
+        except (ValueError, TypeError):
+            pass
+        raise ValueError(f"Line {number}: {name} must be a valid number, got {value!r}")
+
+
+def validate_chunk(rows, seen):
+    """Turn a chunk of raw rows into checked columns; `seen` holds the PIDs so far."""
+    numbers = [number for number, _ in rows]
+    pids = [str(row[0]).strip() for _, row in rows]
+    arrival = to_floats([row[1] for _, row in rows], numbers, "Arrival time")
+    burst = to_floats([row[2] for _, row in rows], numbers, "Burst time")
+    priority = to_floats([row[3] for _, row in rows], numbers, "Priority")
+
+    # Whole-column checks first; the slow search for the offending row only
+    # runs when one of them fails
+    if min(arrival) < 0:
+        raise ValueError(f"Line {numbers[arrival.index(min(arrival))]}: Arrival time cannot be negative")
+    if min(burst) <= 0:
+        raise ValueError(f"Line {numbers[burst.index(min(burst))]}: Burst time must be greater than zero")
+    new = set(pids)
+    if len(new) != len(pids) or not seen.isdisjoint(new):
+        chunk_seen = set()
+        for pid, number in zip(pids, numbers):
+            if pid in seen or pid in chunk_seen:
+                raise ValueError(f"Line {number}: Process with PID {pid} already exists")
+            chunk_seen.add(pid)
+    seen |= new
+    return pids, arrival, burst, priority
+
+
+def read_trace(path, format=None, use_mmap=False, chunk_size=CHUNK_SIZE, seen=None):
+    """Yield validated (pids, arrival, burst, priority) column chunks from a trace file.
+
+    `format` is 'csv' or 'jsonl', taken from the file extension by default.
+    `seen` is a set of PIDs already loaded; it is updated as chunks are read.
+    """
+    if format is None:
+        format = 'jsonl' if os.path.splitext(path)[1].lower() in ('.jsonl', '.json') else 'csv'
+    if format not in ('csv', 'jsonl'):
+        raise ValueError(f"Unknown trace format: {format}")
+    rows_of = csv_rows if format == 'csv' else jsonl_rows
+    seen = set() if seen is None else seen
+
+    rows = []
+    for row in rows_of(read_lines(path, use_mmap)):
+        rows.append(row)
+        if len(rows) == chunk_size:
+            yield validate_chunk(rows, seen)
+            rows = []
+    if rows:
+        yield validate_chunk(rows, seen)
+
+
+def load_trace(path, table=None, **options):
+    """Append the processes of a trace file to `table` (a new ProcessTable by default).
+
+    Options are passed to read_trace. Chunks read before an invalid row
+    stay in the table, so load into a fresh table when that matters.
+    """
+    if table is None:
+        table = ProcessTable()
+    seen = set(table.index)
+    for pids, arrival, burst, priority in read_trace(path, seen=seen, **options):
+        table.extend(pids, arrival, burst, priority)
+    if not len(table):
+        raise ValueError("Trace contains no processes")
+    return table
@@ -0,0 +1,172 @@
+"""Seeded synthetic workloads for load tests and the GUI's Random button.
+
+Arrival patterns, burst-time and priority distributions, and optional
+I/O bursts between CPU bursts, are drawn with NumPy in fixed-size
+chunks, so millions of processes can be generated without holding them
+all at once. The same seed and options always give the same processes,
+whether they are read as chunks, as a lazy stream or as a ProcessTable,
+and a smaller count gives a prefix of a larger one; a count of None
+streams them without end.
+
+    from workload import generate, make_table
+    for pid, arrival, burst, priority in generate(10, seed=1, burst="Pareto"):
+        print(pid, arrival, burst, priority)
+    table = make_table(10**6, seed=1, arrival="Bursty")
+"""
+import itertools
+
+import numpy as np
+
+from process_table import ProcessTable
+
+ARRIVAL_PATTERNS = ["Poisson", "Bursty"]
+BURST_DISTRIBUTIONS = ["Exponential", "Pareto", "Bimodal", "Uniform"]
+PRIORITY_DISTRIBUTIONS = ["Uniform", "Skewed"]
+
+CHUNK_SIZE = 1 << 16
+PARETO_SHAPE = 1.5  # Heavy tail with a finite mean
+LONG_JOB_SHARE = 0.2  # Bimodal: fraction of long jobs, 3x the mean burst
+MEAN_BURST = 5.0
+MIN_BURST = 0.01
+STREAMS = ['gap', 'group', 'burst', 'mode', 'priority', 'split', 'io', 'device']
+
+
+def arrival_gaps(rngs, n, pattern, rate, group_size):
+    """Return `n` inter-arrival gaps for an average of `rate` arrivals per unit."""
+    if pattern == "Poisson":
+        return rngs['gap'].exponential(1 / rate, n)
+    # Bursty: groups of geometric size arrive together, the groups themselves
+    # as a Poisson process, keeping the long-run rate at `rate`
+    new_group = rngs['group'].random(n) < 1 / group_size
+    return np.where(new_group, rngs['gap'].exponential(group_size / rate, n), 0.0)
+
+
+def burst_times(rngs, n, distribution, mean):
+    """Return `n` burst times with the given distribution and mean."""
+    rng = rngs['burst']
+    if distribution == "Exponential":
+        bursts = rng.exponential(mean, n)
+    elif distribution == "Pareto":
+        scale = mean * (PARETO_SHAPE - 1) / PARETO_SHAPE
+        bursts = (rng.pareto(PARETO_SHAPE, n) + 1) * scale
+    elif distribution == "Bimodal":
+        # Short and long jobs around two centres whose mix averages to `mean`
+        long_job = rngs['mode'].random(n) < LONG_JOB_SHARE
+        short = mean * (1 - 3 * LONG_JOB_SHARE) / (1 - LONG_JOB_SHARE)
+        centre = np.where(long_job, 3 * mean, short)
+        bursts = centre * (1 + rng.standard_normal(n) / 10)
+    else:
+        bursts = rng.uniform(1, 2 * mean - 1, n) if mean > 1 else np.full(n, mean)
+    return np.maximum(np.round(bursts, 2), MIN_BURST)
+
+
+def priorities(rngs, n, distribution, levels):
+    """Return `n` priorities in 1..levels, or zeros when `distribution` is None."""
+    if distribution is None:
+        return np.zeros(n)
+    if distribution == "Uniform":
+        return rngs['priority'].integers(1, levels + 1, n).astype(np.float64)
+    # Skewed: each level half as common as the one below it
+    return np.minimum(rngs['priority'].geometric(0.5, n), levels).astype(np.float64)
+
+
+def burst_phases(rngs, bursts, io_bursts, io_mean, devices):
+    """Split each CPU time in `bursts` around `io_bursts` I/O bursts.
+
+    Returns (bursts, phases) with the CPU totals after rounding and the
+    burst sequences as ProcessTable.extend takes them. The cut points are
+    uniform, so the CPU demand and the load stay as without I/O; I/O
+    bursts are exponential with mean `io_mean` on uniformly chosen devices.
+    """
+    n = len(bursts)
+    width = 2 * io_bursts + 1
+    shares = rngs['split'].exponential(1, (n, io_bursts + 1))
+    cpu = np.maximum(np.round(bursts[:, None] * shares / shares.sum(axis=1, keepdims=True), 2), MIN_BURST)
+    lengths = np.empty((n, width))
+    lengths[:, ::2] = cpu
+    lengths[:, 1::2] = np.maximum(np.round(rngs['io'].exponential(io_mean, (n, io_bursts)), 2), MIN_BURST)
+    phase_devices = np.zeros((n, width), dtype=np.int64)
+    phase_devices[:, 1::2] = rngs['device'].integers(0, devices, (n, io_bursts))
+    offsets = np.arange(n + 1) * width
+    return cpu.sum(axis=1), (offsets, lengths.ravel(), phase_devices.ravel())
+
+
+def generate_chunks(count, seed=0, arrival="Poisson", rate=1.0, group_size=10,
+                    burst="Exponential", mean_burst=MEAN_BURST, priority="Uniform", levels=5,
+                    io_bursts=0, io_mean=5.0, devices=1, chunk_size=CHUNK_SIZE):
+    """Yield the workload as dicts of NumPy arrays, at most `chunk_size` processes each.
+
+    A `count` of None makes the workload endless, for streaming runs.
+    Each dict holds 'start' (the index of its first process) and 'arrival',
+    'burst' and 'priority' arrays. Arrivals are non-decreasing across chunks.
+    With `io_bursts` I/O bursts per process it also holds 'phases', the
+    burst sequences as ProcessTable.extend takes them, and 'burst' is the
+    total CPU time.
+    """
+    if arrival not in ARRIVAL_PATTERNS:
+        raise ValueError(f"Unknown arrival pattern: {arrival}")
+    if burst not in BURST_DISTRIBUTIONS:
+        raise ValueError(f"Unknown burst distribution: {burst}")
+    if priority is not None and priority not in PRIORITY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown priority distribution: {priority}")
+    if count is not None and count < 1:
+        raise ValueError("Process count must be at least 1")
+    if rate <= 0 or mean_burst <= 0:
+        raise ValueError("Arrival rate and mean burst must be greater than zero")
+    if group_size < 1 or levels < 1:
+        raise ValueError("Group size and priority levels must be at least 1")
+    if io_bursts < 0 or io_mean <= 0 or devices < 1:
+        raise ValueError("I/O bursts cannot be negative, and the I/O mean and devices must be positive")
+
+    # One independent stream per random quantity, so the first N processes
+    # are the same whatever the count and chunk size
+    streams = np.random.SeedSequence(seed).spawn(len(STREAMS))
+    rngs = {name: np.random.default_rng(s) for name, s in zip(STREAMS, streams)}
+    clock = 0.0
+    starts = itertools.count(0, chunk_size) if count is None else range(0, count, chunk_size)
+    for start in starts:
+        n = chunk_size if count is None else min(chunk_size, count - start)
+        arrivals = clock + np.cumsum(arrival_gaps(rngs, n, arrival, rate, group_size))
+        clock = arrivals[-1]
+        chunk = {
+            'start': start,
+            'arrival': np.round(arrivals, 2),
+            'burst': burst_times(rngs, n, burst, mean_burst),
+            'priority': priorities(rngs, n, priority, levels),
+        }
+        if io_bursts:
+            chunk['burst'], chunk['phases'] = burst_phases(rngs, chunk['burst'], io_bursts, io_mean, devices)
+        yield chunk
+
+
+def generate(count, seed=0, **options):
+    """Lazily yield (pid, arrival, burst, priority) for each process of the workload.
+
+    With I/O bursts, `burst` is the list of the process's burst times;
+    the device of each I/O burst is in the chunks of generate_chunks.
+    """
+    for chunk in generate_chunks(count, seed, **options):
+        start = chunk['start']
+        bursts = chunk['burst'].tolist()
+        if 'phases' in chunk:
+            offsets, lengths, _ = chunk['phases']
+            width = offsets[1]
+            bursts = lengths.reshape(-1, width).tolist()
+        columns = zip(chunk['arrival'].tolist(), bursts, chunk['priority'].tolist())
+        for i, (arrival, burst, priority) in enumerate(columns, start):
+            yield f"P{i}", arrival, burst, priority
+
+
+def make_table(count, seed=0, table=None, **options):
+    """Generate the workload into `table` (a new ProcessTable by default) and return it."""
+    if table is None:
+        table = ProcessTable()
+    for chunk in generate_chunks(count, seed, **options):
+        start = chunk['start']
+        phases = chunk.get('phases')
+        if phases is not None:
+            phases = [column.tolist() for column in phases]
+        table.extend([f"P{i}" for i in range(start, start + len(chunk['arrival']))],
+                     chunk['arrival'].tolist(), chunk['burst'].tolist(), chunk['priority'].tolist(),
+                     phases)
+    return table